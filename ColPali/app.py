@@ -7,12 +7,12 @@ Opens at http://localhost:7860 with share=True for public URL.
 """
 import os
 import shutil
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import gradio as gr
 from PIL import Image
 
-from config import get_config, DEFAULT_PDFS
+from config import get_config, get_default_pdfs
 from storage import add_file_to_storage, list_available_files
 from rag_service import RAGService
 
@@ -34,14 +34,9 @@ def prepare_data() -> str:
     try:
         service = get_service()
         
-        # Check if already indexed
-        if service.is_indexed:
-            files = list_available_files(config.storage.data_dir)
-            return f"Data already indexed. Files: {', '.join(files)}"
-        
         # Verify local PDF files exist
         missing = []
-        for name, path in DEFAULT_PDFS.items():
+        for name, path in get_default_pdfs().items():
             if not os.path.exists(path):
                 missing.append(f"{name} ({path})")
         
@@ -76,7 +71,7 @@ def save_uploaded_files(uploaded_files) -> str:
                 src = str(f)
 
             dest = os.path.join(config.storage.data_dir, os.path.basename(src))
-            shutil.copy(src, dest)
+            shutil.copyfile(src, dest)
             saved.append(dest)
         return f"Saved {len(saved)} file(s)."
     except Exception as e:
@@ -100,27 +95,37 @@ def add_from_path_or_url(path_or_url: str) -> str:
     """Add file from local path or URL."""
     config = get_config()
     try:
-        return add_file_to_storage(path_or_url, config.storage.data_dir)
+        return add_file_to_storage(
+            path_or_url,
+            config.storage.data_dir,
+            chunk_size=config.storage.chunk_size,
+        )
     except Exception as e:
         return f"Failed: {e}"
 
 
 def run_query(
     query: str, top_k: int, max_tokens: int
-) -> Tuple[str, List[Image.Image]]:
-    """Execute RAG query."""
+) -> Iterator[Tuple[str, List[Image.Image]]]:
+    """Execute RAG query, streaming the answer as it is generated.
+
+    Gradio iterates sync generators in a worker thread, so the pipeline
+    stays off the event loop.
+    """
     try:
         service = get_service()
         if not service.is_indexed:
             # Auto-prepare if not indexed
             result = prepare_data()
             if not service.is_indexed:
-                return f"Indexing failed: {result}", []
+                yield f"Indexing failed: {result}", []
+                return
 
-        answer, images = service.query(query, top_k=top_k, max_new_tokens=max_tokens)
-        return answer, images
+        yield from service.query_stream(
+            query, top_k=top_k, max_new_tokens=max_tokens
+        )
     except Exception as e:
-        return f"Error: {e}", []
+        yield f"Error: {e}", []
 
 
 def build_interface() -> gr.Blocks:
@@ -134,6 +139,12 @@ def build_interface() -> gr.Blocks:
     except Exception as e:
         print(f"Warning: Failed to auto-index data on startup: {e}")
 
+    # Load the VL model once so the first query doesn't pay for it
+    try:
+        get_service().warmup()
+    except Exception as e:
+        print(f"Warning: Failed to load models on startup: {e}")
+
     with gr.Blocks() as demo:
         with gr.Row():
             if os.path.exists(logo_path):
@@ -182,6 +193,7 @@ def build_interface() -> gr.Blocks:
             fn=run_query,
             inputs=[query, top_k, max_tokens],
             outputs=[out_text, gallery],
+            api_name="query",
         )
 
     return demo
@@ -189,4 +201,7 @@ def build_interface() -> gr.Blocks:
 
 if __name__ == "__main__":
     demo = build_interface()
+    # Let several queries retrieve concurrently; VL decoding is serialized
+    # inside VisionLanguageModel
+    demo.queue(default_concurrency_limit=4, max_size=32)
     demo.launch(share=True)
@@ -1,38 +1,67 @@
 """Centralized configuration for ColPali application."""
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
+# Slotted config instances need Python 3.10+ dataclasses. Kept local rather
+# than imported from evaluation._compat, which would load the evaluation
+# package on every import of the app config.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ModelConfig:
     """Configuration for ML models."""
     retrieval_model_name: str = "vidore/colpali-v1.2"
     vl_model_name: str = "Qwen/Qwen3-VL-4B-Instruct"
-    use_fast_processor: bool = False
+    use_fast_processor: bool = True
     min_pixels: int = 224 * 224
     max_pixels: int = 1024 * 1024
+    # Opt-in VL weight-only quantization on CUDA: "int8" or "nf4"
+    # (bitsandbytes), "fp8" (torchao) or "none"; ignored on CPU/MPS
+    quantization: str = "none"
+    # torch.compile the model forwards on CUDA (slow first calls per shape)
+    compile_retrieval_model: bool = False
+    compile_vl_model: bool = False  # Unquantized VL model on sm_70+ only
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StorageConfig:
     """Configuration for file storage."""
     data_dir: str = "data"
     supported_extensions: Tuple[str, ...] = (".pdf", ".png", ".jpg", ".jpeg")
-    chunk_size: int = 8192
+    chunk_size: int = 1 << 20  # Streaming copy size for URL downloads
+    dpi: int = 100  # PDF page rendering resolution
+    cache_dir: Optional[str] = "data/_cache"  # Rendered page JPEGs; None disables
+    render_workers: Optional[int] = None  # PDF render processes; None uses all CPUs
+    index_batch_size: int = 16  # Pages per ColPali forward pass when indexing
+    # ColPali page embeddings per document file; None disables
+    embedding_cache_dir: Optional[str] = "data/_cache/embeddings"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QdrantConfig:
     """Configuration for Qdrant vector database."""
     host: str = "localhost"
     port: int = 6333
+    # Server mode only: protobuf over gRPC instead of JSON over HTTP, which
+    # keeps multi-vector upserts and queries far smaller on the wire
+    prefer_grpc: bool = True
+    grpc_port: int = 6334
     collection_name: str = "colpali_documents"
     vector_size: int = 128  # ColPali embedding dimension
     use_memory: bool = True  # Use in-memory storage for development
     persist_directory: Optional[str] = "qdrant_data"
+    # Stored-vector quantization: "int8" (scalar), "pq8", "binary" or "none".
+    # Applied when the collection is created; originals are kept for
+    # rescoring the candidates.
+    quantization: str = "int8"
+    oversampling: float = 2.0  # Quantized candidates fetched per result
+    upsert_batch_size: int = 64  # Points buffered per add_document() upsert
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RAGConfig:
     """Configuration for RAG operations."""
     default_top_k: int = 1
@@ -40,9 +69,22 @@ class RAGConfig:
     # Page overlap: include adjacent pages for cross-page content
     pages_before: int = 1  # Number of pages to include before each result
     pages_after: int = 1   # Number of pages to include after each result
+    # Upper bound on pages sent to the VL model per query (None: no limit);
+    # retrieved pages are kept before their neighbours
+    max_images: Optional[int] = 8
+    preload_vl: bool = True  # Load the VL model in the background while indexing
+    # Prefix KV cache for the VL model (disabled when kv_cache_dir is None)
+    kv_cache_dir: Optional[str] = None
+    precompute_kv_cache: bool = False  # Prefill every page window at index time
+    # Semantic answer cache for near-duplicate questions; opt-in until the
+    # threshold has been checked on real query pairs
+    semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.95  # Minimum cosine similarity for a hit
+    semantic_cache_path: Optional[str] = "sem_cache.npz"
+    semantic_cache_max_entries: Optional[int] = 128  # Oldest evicted first
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppConfig:
     """Main application configuration."""
     model: ModelConfig = field(default_factory=ModelConfig)
@@ -51,11 +93,13 @@ class AppConfig:
     rag: RAGConfig = field(default_factory=RAGConfig)
 
 
-# Default PDFs from local data directory
-DEFAULT_PDFS: Dict[str, str] = {
-    "ARCMIS_v5_Operation_Manual": "data/ARCMIS_v5_Operation_Manual.pdf",
-    "IT_help_desk": "data/IT_help_desk.pdf",
-}
+@lru_cache(maxsize=1)
+def get_default_pdfs() -> Dict[str, str]:
+    """Returns the default PDFs from the local data directory (name -> path)."""
+    return {
+        "ARCMIS_v5_Operation_Manual": "data/ARCMIS_v5_Operation_Manual.pdf",
+        "IT_help_desk": "data/IT_help_desk.pdf",
+    }
 
 
 def get_config() -> AppConfig:
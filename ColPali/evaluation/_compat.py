@@ -0,0 +1,6 @@
+"""Python version compatibility helpers."""
+import sys
+
+# Keyword arguments for @dataclass: slotted instances (no per-instance
+# __dict__) where supported, which needs Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -0,0 +1,34 @@
+"""JSON helpers that use orjson when it is installed."""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON, preferring orjson's C parser.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error
+            type subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to compact, non-ASCII-escaped JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Serialize to 2-space indented UTF-8 JSON bytes for human-read files."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
@@ -1,9 +1,11 @@
 """Configuration for evaluation module."""
 from dataclasses import dataclass, field
-from typing import List, Literal
+from typing import Literal
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class JudgeConfig:
     """Configuration for LLM-as-a-Judge."""
 
@@ -18,9 +20,11 @@ class JudgeConfig:
     temperature: float = 0.0
     max_retries: int = 3
     timeout: int = 120
+    # HTTP connection pool size; keep >= EvaluationConfig.batch_size
+    max_connections: int = 10
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class GenerationMetricsConfig:
     """Configuration for generation evaluation."""
 
@@ -31,7 +35,7 @@ class GenerationMetricsConfig:
     evaluate_faithfulness: bool = True
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EvaluationConfig:
     """Main evaluation configuration."""
 
@@ -40,6 +44,9 @@ class EvaluationConfig:
     batch_size: int = 10
     output_dir: str = "evaluation_results"
     save_intermediate: bool = True
+    # Run RAG once per distinct question; repeats reuse its answer, pages
+    # and latency (generation is greedy, so a rerun would match)
+    cache_duplicate_queries: bool = True
 
 
 def get_evaluation_config() -> EvaluationConfig:
@@ -1,12 +1,16 @@
 """Main RAG evaluation orchestrator."""
-import json
 import os
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from functools import cached_property
+from typing import IO, Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
+from . import _json
 from .config import EvaluationConfig
+from ._compat import DATACLASS_SLOTS
 from .test_case import TestCase, TestDataset
 from .metrics.generation_metrics import GenerationEvalResult, GenerationMetricsAggregator
 from .metrics.retrieval_metrics import (
@@ -19,7 +23,7 @@ from .judges.openai_judge import OpenAIJudge
 from .judges.ollama_judge import OllamaJudge
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EvaluationResult:
     """Result for a single test case."""
 
@@ -31,9 +35,18 @@ class EvaluationResult:
     latency_ms: float
     metadata: Dict[str, Any] = field(default_factory=dict)
     retrieval_metrics: Optional[Dict[str, Any]] = None
-
-
-@dataclass
+    # Time spent in the LLM judge; latency_ms covers the RAG query only
+    judge_latency_ms: Optional[float] = None
+    # Raw metric objects for aggregation; not serialized
+    generation_result: Optional[GenerationEvalResult] = field(
+        default=None, repr=False, compare=False
+    )
+    retrieval_result: Optional[RetrievalEvalResult] = field(
+        default=None, repr=False, compare=False
+    )
+
+
+@dataclass(**DATACLASS_SLOTS)
 class EvaluationReport:
     """Complete evaluation report."""
 
@@ -44,6 +57,8 @@ class EvaluationReport:
     individual_results: List[EvaluationResult]
     evaluation_config: Dict[str, Any]
     timestamp: str
+    # Test cases answered from an earlier identical question
+    rag_cache_hits: int = 0
 
 
 class RAGEvaluator:
@@ -62,17 +77,14 @@ class RAGEvaluator:
         """
         self.rag_service = rag_service
         self.config = config or EvaluationConfig()
-        self._judge: Optional[BaseJudge] = None
+        self._ndjson_fh: Optional[IO[str]] = None
 
-    @property
+    @cached_property
     def judge(self) -> BaseJudge:
         """Lazy-load judge based on configuration."""
-        if self._judge is None:
-            if self.config.judge.judge_type == "ollama":
-                self._judge = OllamaJudge(self.config.judge)
-            else:
-                self._judge = OpenAIJudge(self.config.judge)
-        return self._judge
+        if self.config.judge.judge_type == "ollama":
+            return OllamaJudge(self.config.judge)
+        return OpenAIJudge(self.config.judge)
 
     def evaluate_single(self, test_case: TestCase) -> EvaluationResult:
         """Evaluate a single test case.
@@ -83,19 +95,84 @@ class RAGEvaluator:
         Returns:
             EvaluationResult with metrics
         """
-        start_time = time.time()
+        query_result, latency_ms = self._run_rag(test_case)
+        return self._judge_and_assemble(test_case, query_result, latency_ms)
+
+    def _run_rag(self, test_case: TestCase) -> Tuple[Any, float]:
+        """Run the RAG query for a test case.
+
+        Args:
+            test_case: Test case to query
+
+        Returns:
+            Tuple of (QueryResult, latency_ms). The page images are dropped,
+            since judging only needs the answer and retrieved pages.
+        """
+        start_ns = time.perf_counter_ns()
 
         # Run RAG query with detailed results
         query_result = self.rag_service.query_with_details(test_case.question)
 
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        query_result.retrieved_images = []
+        return query_result, latency_ms
+
+    def _run_rag_all(
+        self, test_cases: List[TestCase]
+    ) -> Iterator[Tuple[Any, float, bool]]:
+        """Run the RAG query for every test case, in order.
+
+        Results are yielded as each query finishes, so they can be judged
+        while the next one runs. With config.cache_duplicate_queries, a
+        question seen earlier in the dataset reuses that run's QueryResult
+        with a latency of 0, since no RAG time was spent on it; each test
+        case is still judged against its own expected answer.
+
+        Args:
+            test_cases: Test cases to query
+
+        Yields:
+            Tuples of (QueryResult, latency_ms, reused), one per test case
+        """
+        seen: Dict[str, Tuple[Any, float]] = {}
+        for test_case in test_cases:
+            key = test_case.question.strip()
+            output = seen.get(key) if self.config.cache_duplicate_queries else None
+            if output is None:
+                output = seen[key] = self._run_rag(test_case)
+                yield output[0], output[1], False
+            else:
+                yield output[0], 0.0, True
+
+    def _judge_and_assemble(
+        self,
+        test_case: TestCase,
+        query_result: Any,
+        latency_ms: float,
+        rag_cached: bool = False,
+    ) -> EvaluationResult:
+        """Judge a RAG answer and build its EvaluationResult.
+
+        Only talks to the judge API, so it is safe to run from worker threads.
+
+        Args:
+            test_case: Test case that was queried
+            query_result: QueryResult from _run_rag()
+            latency_ms: RAG latency in milliseconds
+            rag_cached: Whether query_result was reused from an earlier
+                identical question; recorded as metadata["rag_cached"]
 
+        Returns:
+            EvaluationResult with metrics
+        """
         # Evaluate generation quality with LLM judge
+        judge_start_ns = time.perf_counter_ns()
         gen_result = self.judge.evaluate_generation(
             question=test_case.question,
             expected_answer=test_case.expected_answer,
             generated_answer=query_result.answer,
         )
+        judge_latency_ms = (time.perf_counter_ns() - judge_start_ns) / 1_000_000
 
         # Calculate retrieval metrics
         # Always record retrieved pages; calculate full metrics if expected pages provided
@@ -105,6 +182,10 @@ class RAGEvaluator:
         )
         retrieval_metrics = retrieval_result.to_dict()
 
+        metadata = test_case.metadata
+        if rag_cached:
+            metadata = {**metadata, "rag_cached": True}
+
         return EvaluationResult(
             test_case_id=test_case.id,
             question=test_case.question,
@@ -112,8 +193,11 @@ class RAGEvaluator:
             expected_answer=test_case.expected_answer,
             generation_metrics=gen_result.to_dict(),
             latency_ms=latency_ms,
-            metadata=test_case.metadata,
+            metadata=metadata,
             retrieval_metrics=retrieval_metrics,
+            judge_latency_ms=judge_latency_ms,
+            generation_result=gen_result,
+            retrieval_result=retrieval_result,
         )
 
     def evaluate_dataset(
@@ -123,6 +207,11 @@ class RAGEvaluator:
     ) -> EvaluationReport:
         """Evaluate entire test dataset.
 
+        RAG queries run sequentially (they share one GPU model); each answer
+        is handed to the judge as soon as its query finishes, and judge calls
+        run concurrently on up to config.batch_size threads since they are
+        network-bound.
+
         Args:
             dataset: Test dataset to evaluate
             progress_callback: Optional callback(current, total) for progress
@@ -130,51 +219,65 @@ class RAGEvaluator:
         Returns:
             EvaluationReport with aggregate and individual results
         """
+        try:
+            return self._evaluate_dataset(dataset, progress_callback)
+        finally:
+            self.close()
+
+    def _evaluate_dataset(
+        self,
+        dataset: TestDataset,
+        progress_callback: Optional[Callable[[int, int], None]],
+    ) -> EvaluationReport:
+        """Body of evaluate_dataset(); see there."""
         results = []
-        generation_agg = GenerationMetricsAggregator()
-        retrieval_agg = RetrievalMetricsAggregator()
+        # Each EvaluationResult already holds its metric objects, so the
+        # aggregators only need their running sums
+        generation_agg = GenerationMetricsAggregator(keep_individual=False)
+        retrieval_agg = RetrievalMetricsAggregator(keep_individual=False)
 
-        for i, test_case in enumerate(dataset.test_cases):
-            result = self.evaluate_single(test_case)
-            results.append(result)
+        rag_cache_hits = 0
+        total = len(dataset.test_cases)
 
-            # Aggregate generation metrics
-            generation_agg.add_result(
-                GenerationEvalResult(
-                    correctness=result.generation_metrics["correctness"],
-                    completeness=result.generation_metrics["completeness"],
-                    relevance=result.generation_metrics["relevance"],
-                    coherence=result.generation_metrics["coherence"],
-                    overall_score=result.generation_metrics["overall_score"],
-                    reasoning=result.generation_metrics["reasoning"],
-                )
-            )
+        def record(result: EvaluationResult) -> None:
+            results.append(result)
 
-            # Aggregate retrieval metrics
-            retrieval_agg.add_result(
-                RetrievalEvalResult(
-                    retrieved_pages=[
-                        (p["doc_id"], p["page_num"])
-                        for p in result.retrieval_metrics["retrieved_pages"]
-                    ],
-                    expected_pages=[
-                        (p["doc_id"], p["page_num"])
-                        for p in result.retrieval_metrics["expected_pages"]
-                    ],
-                    hit=result.retrieval_metrics["hit"],
-                    recall=result.retrieval_metrics["recall"],
-                    precision=result.retrieval_metrics["precision"],
-                    mrr=result.retrieval_metrics["mrr"],
-                )
-            )
+            # Aggregate from the result objects the judge step produced
+            generation_agg.add_result(result.generation_result)
+            retrieval_agg.add_result(result.retrieval_result)
 
             if progress_callback:
-                progress_callback(i + 1, len(dataset.test_cases))
+                progress_callback(len(results), total)
 
             # Save intermediate results
             if self.config.save_intermediate:
                 self._save_intermediate(result)
 
+        # Build the judge before fanning out so workers share one instance
+        _ = self.judge
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=max(1, self.config.batch_size)) as executor:
+            for test_case, (query_result, latency_ms, reused) in zip(
+                dataset.test_cases, self._run_rag_all(dataset.test_cases)
+            ):
+                rag_cache_hits += reused
+                pending.append(
+                    executor.submit(
+                        self._judge_and_assemble,
+                        test_case,
+                        query_result,
+                        latency_ms,
+                        reused,
+                    )
+                )
+                # Aggregate on this thread, in dataset order, as judgements
+                # complete, so a crash mid-run keeps every saved case
+                while pending and pending[0].done():
+                    record(pending.popleft().result())
+
+            while pending:
+                record(pending.popleft().result())
+
         return EvaluationReport(
             dataset_name=dataset.dataset_name,
             total_test_cases=len(dataset.test_cases),
@@ -183,16 +286,29 @@ class RAGEvaluator:
             individual_results=results,
             evaluation_config=self._config_to_dict(),
             timestamp=datetime.now().isoformat(),
+            rag_cache_hits=rag_cache_hits,
         )
 
+    def close(self) -> None:
+        """Flush and close the intermediate results file, if open."""
+        if self._ndjson_fh is not None:
+            self._ndjson_fh.close()
+            self._ndjson_fh = None
+
     def _save_intermediate(self, result: EvaluationResult) -> None:
-        """Save intermediate result to file.
+        """Append an intermediate result to output_dir/results.ndjson.
 
         Args:
             result: Single evaluation result
         """
-        os.makedirs(self.config.output_dir, exist_ok=True)
-        path = os.path.join(self.config.output_dir, f"{result.test_case_id}.json")
+        if self._ndjson_fh is None:
+            os.makedirs(self.config.output_dir, exist_ok=True)
+            self._ndjson_fh = open(
+                os.path.join(self.config.output_dir, "results.ndjson"),
+                "a",
+                encoding="utf-8",
+                buffering=1 << 20,
+            )
 
         data = {
             "test_case_id": result.test_case_id,
@@ -202,11 +318,11 @@ class RAGEvaluator:
             "generation_metrics": result.generation_metrics,
             "retrieval_metrics": result.retrieval_metrics,
             "latency_ms": result.latency_ms,
+            "judge_latency_ms": result.judge_latency_ms,
             "metadata": result.metadata,
         }
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._ndjson_fh.write(_json.dumps(data) + "\n")
 
     def _config_to_dict(self) -> Dict[str, Any]:
         """Convert config to serializable dict."""
@@ -214,4 +330,5 @@ class RAGEvaluator:
             "judge_type": self.config.judge.judge_type,
             "judge_model": self.config.judge.model_name,
             "output_dir": self.config.output_dir,
+            "cache_duplicate_queries": self.config.cache_duplicate_queries,
         }
@@ -0,0 +1,70 @@
+"""Prompt templates shared by the LLM judges."""
+from .base_judge import split_template
+
+
+GENERATION_JUDGE_PROMPT = """You are an expert evaluator assessing the quality of AI-generated answers in a document question-answering system.
+
+## Task
+Evaluate the GENERATED ANSWER against the REFERENCE ANSWER for the given QUESTION.
+
+## Evaluation Criteria
+Score each dimension from 1-5:
+
+### Correctness (1-5)
+- 5: Completely accurate, all facts match reference
+- 4: Mostly accurate, minor omissions
+- 3: Partially accurate, some incorrect details
+- 2: Mostly incorrect, few accurate points
+- 1: Completely incorrect or irrelevant
+
+### Completeness (1-5)
+- 5: Covers all key points from reference
+- 4: Covers most key points
+- 3: Covers some key points
+- 2: Missing most key points
+- 1: Missing all key points
+
+### Relevance (1-5)
+- 5: Directly addresses the question
+- 4: Mostly relevant with minor tangents
+- 3: Somewhat relevant
+- 2: Mostly irrelevant
+- 1: Completely off-topic
+
+### Coherence (1-5)
+- 5: Clear, well-structured, easy to follow
+- 4: Generally clear with minor issues
+- 3: Understandable but disorganized
+- 2: Difficult to follow
+- 1: Incoherent
+
+## Input
+QUESTION: {question}
+
+REFERENCE ANSWER: {expected_answer}
+
+GENERATED ANSWER: {generated_answer}
+
+## Output Format
+Respond with a JSON object ONLY (no additional text):
+{{
+    "correctness": <1-5>,
+    "completeness": <1-5>,
+    "relevance": <1-5>,
+    "coherence": <1-5>,
+    "overall_score": <1-5>,
+    "reasoning": "<brief explanation of scores>"
+}}
+"""
+
+# Template split once at import; fields are question, expected_answer,
+# generated_answer in that order
+_PROMPT_PIECES = split_template(GENERATION_JUDGE_PROMPT)
+
+
+def build_generation_prompt(
+    question: str, expected_answer: str, generated_answer: str
+) -> str:
+    """Fill GENERATION_JUDGE_PROMPT without re-parsing it."""
+    p0, p1, p2, p3 = _PROMPT_PIECES
+    return p0 + question + p1 + expected_answer + p2 + generated_answer + p3
@@ -1,11 +1,36 @@
 """Abstract base class for LLM judges."""
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 import json
 import re
+import string
 
+from .. import _json
 from ..metrics.generation_metrics import GenerationEvalResult
 
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+_BRACE_RE = re.compile(r"\{[\s\S]*\}")
+
+
+def split_template(template: str) -> List[str]:
+    """Split a str.format template into the literal text around its fields.
+
+    Escaped braces are unescaped, so joining the pieces with the field
+    values in order reproduces template.format(...).
+
+    Args:
+        template: str.format-style template
+
+    Returns:
+        Literal pieces; one more than the number of fields
+    """
+    pieces = [""]
+    for literal, field_name, _, _ in string.Formatter().parse(template):
+        pieces[-1] += literal
+        if field_name is not None:
+            pieces.append("")
+    return pieces
+
 
 class BaseJudge(ABC):
     """Abstract base class for LLM-as-a-Judge implementations."""
@@ -41,26 +66,29 @@ class BaseJudge(ABC):
         Raises:
             ValueError: If JSON cannot be parsed
         """
-        # Try direct JSON parsing
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            pass
-
-        # Extract JSON from markdown code block
-        json_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", response)
-        if json_match:
+        # Try direct JSON parsing; well-behaved judges reply with bare JSON
+        if response.lstrip().startswith("{"):
             try:
-                return json.loads(json_match.group(1))
+                return _json.loads(response)
             except json.JSONDecodeError:
                 pass
 
+        # Extract JSON from markdown code block
+        if "```" in response:
+            json_match = _FENCE_RE.search(response)
+            if json_match:
+                try:
+                    return _json.loads(json_match.group(1))
+                except json.JSONDecodeError:
+                    pass
+
         # Last resort: find JSON-like structure
-        json_match = re.search(r"\{[\s\S]*\}", response)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                pass
+        if "{" in response:
+            json_match = _BRACE_RE.search(response)
+            if json_match:
+                try:
+                    return _json.loads(json_match.group(0))
+                except json.JSONDecodeError:
+                    pass
 
         raise ValueError(f"Could not parse JSON from response: {response[:200]}")
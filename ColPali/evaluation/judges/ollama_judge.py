@@ -1,10 +1,9 @@
 """Ollama-based LLM-as-a-Judge implementation."""
 import os
-import time
+from functools import lru_cache
 from typing import Optional
 
-import requests
-
+from ._prompts import build_generation_prompt
 from .base_judge import BaseJudge
 from ..metrics.generation_metrics import GenerationEvalResult
 from ..config import JudgeConfig
@@ -13,60 +12,10 @@ from ..config import JudgeConfig
 DEFAULT_OLLAMA_URL = "http://localhost:11434"
 
 
-GENERATION_JUDGE_PROMPT = """You are an expert evaluator assessing the quality of AI-generated answers in a document question-answering system.
-
-## Task
-Evaluate the GENERATED ANSWER against the REFERENCE ANSWER for the given QUESTION.
-
-## Evaluation Criteria
-Score each dimension from 1-5:
-
-### Correctness (1-5)
-- 5: Completely accurate, all facts match reference
-- 4: Mostly accurate, minor omissions
-- 3: Partially accurate, some incorrect details
-- 2: Mostly incorrect, few accurate points
-- 1: Completely incorrect or irrelevant
-
-### Completeness (1-5)
-- 5: Covers all key points from reference
-- 4: Covers most key points
-- 3: Covers some key points
-- 2: Missing most key points
-- 1: Missing all key points
-
-### Relevance (1-5)
-- 5: Directly addresses the question
-- 4: Mostly relevant with minor tangents
-- 3: Somewhat relevant
-- 2: Mostly irrelevant
-- 1: Completely off-topic
-
-### Coherence (1-5)
-- 5: Clear, well-structured, easy to follow
-- 4: Generally clear with minor issues
-- 3: Understandable but disorganized
-- 2: Difficult to follow
-- 1: Incoherent
-
-## Input
-QUESTION: {question}
-
-REFERENCE ANSWER: {expected_answer}
-
-GENERATED ANSWER: {generated_answer}
-
-## Output Format
-Respond with a JSON object ONLY (no additional text):
-{{
-    "correctness": <1-5>,
-    "completeness": <1-5>,
-    "relevance": <1-5>,
-    "coherence": <1-5>,
-    "overall_score": <1-5>,
-    "reasoning": "<brief explanation of scores>"
-}}
-"""
+@lru_cache(maxsize=None)
+def _ollama_host(default: str) -> str:
+    """Resolve the Ollama URL once per process (OLLAMA_HOST wins)."""
+    return os.environ.get("OLLAMA_HOST", default)
 
 
 class OllamaJudge(BaseJudge):
@@ -86,13 +35,38 @@ class OllamaJudge(BaseJudge):
             api_key_env_var="",  # Ollama doesn't need API key
         )
         # Priority: OLLAMA_HOST env var > config.base_url > default
-        self.base_url = os.environ.get(
-            "OLLAMA_HOST",
+        self.base_url = _ollama_host(
             getattr(self.config, "base_url", DEFAULT_OLLAMA_URL)
         )
+        self._url = f"{self.base_url}/api/generate"
+        self._options = {"temperature": self.config.temperature}
+
+        # Imported here so OpenAI-only runs never pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Keep-alive session shared by concurrent judge threads; urllib3
+        # retries failed attempts with exponential backoff. max_retries
+        # counts total attempts, Retry.total counts retries after the first.
+        retry = Retry(
+            total=max(0, self.config.max_retries - 1),
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+            raise_on_status=False,
+        )
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.max_connections,
+            pool_maxsize=self.config.max_connections,
+            max_retries=retry,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def _call_llm(self, prompt: str) -> str:
-        """Call Ollama API with retry logic.
+        """Call Ollama API; retries are handled by the session adapter.
 
         Args:
             prompt: Prompt to send to the model
@@ -101,31 +75,21 @@ class OllamaJudge(BaseJudge):
             Model response text
 
         Raises:
-            Exception: If all retries fail
+            requests.RequestException: If all retries fail
         """
-        url = f"{self.base_url}/api/generate"
-
-        for attempt in range(self.config.max_retries):
-            try:
-                response = requests.post(
-                    url,
-                    json={
-                        "model": self.config.model_name,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": self.config.temperature,
-                        },
-                    },
-                    timeout=self.config.timeout,
-                )
-                response.raise_for_status()
-                return response.json()["response"]
-            except Exception as e:
-                if attempt == self.config.max_retries - 1:
-                    raise
-                # Exponential backoff
-                time.sleep(2**attempt)
+        response = self._session.post(
+            self._url,
+            json={
+                "model": self.config.model_name,
+                "prompt": prompt,
+                "stream": False,
+                "format": "json",
+                "options": self._options,
+            },
+            timeout=self.config.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["response"]
 
     def evaluate_generation(
         self,
@@ -143,11 +107,7 @@ class OllamaJudge(BaseJudge):
         Returns:
             GenerationEvalResult with scores and reasoning
         """
-        prompt = GENERATION_JUDGE_PROMPT.format(
-            question=question,
-            expected_answer=expected_answer,
-            generated_answer=generated_answer,
-        )
+        prompt = build_generation_prompt(question, expected_answer, generated_answer)
 
         response = self._call_llm(prompt)
         parsed = self._parse_json_response(response)
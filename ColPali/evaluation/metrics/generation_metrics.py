@@ -2,8 +2,10 @@
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 
+from .._compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class GenerationEvalResult:
     """Result from LLM-as-a-Judge evaluation."""
 
@@ -17,7 +19,21 @@ class GenerationEvalResult:
     unsupported_claims: Optional[List[str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
+        """Convert to dictionary.
+
+        Optional fields are only included when set; the common case where
+        neither is set returns a fixed-shape dict literal directly.
+        """
+        if self.faithfulness_score is None and self.unsupported_claims is None:
+            return {
+                "correctness": self.correctness,
+                "completeness": self.completeness,
+                "relevance": self.relevance,
+                "coherence": self.coherence,
+                "overall_score": self.overall_score,
+                "reasoning": self.reasoning,
+            }
+
         result = {
             "correctness": self.correctness,
             "completeness": self.completeness,
@@ -34,14 +50,42 @@ class GenerationEvalResult:
 
 
 class GenerationMetricsAggregator:
-    """Aggregates generation metrics across test cases."""
+    """Aggregates generation metrics across test cases.
 
-    def __init__(self):
+    Running sums are updated in add_result(), so aggregate() is O(1) and
+    can be called after every result for live progress.
+    """
+
+    def __init__(self, keep_individual: bool = True):
+        """Initialize the aggregator.
+
+        Args:
+            keep_individual: Whether to retain each result in self.results
+        """
+        self.keep_individual = keep_individual
         self.results: List[GenerationEvalResult] = []
+        self._n = 0
+        self._correctness = 0.0
+        self._completeness = 0.0
+        self._relevance = 0.0
+        self._coherence = 0.0
+        self._overall = 0.0
+        self._faithfulness_sum = 0.0
+        self._faithfulness_count = 0
 
     def add_result(self, result: GenerationEvalResult) -> None:
         """Add a single evaluation result."""
-        self.results.append(result)
+        if self.keep_individual:
+            self.results.append(result)
+        self._n += 1
+        self._correctness += result.correctness
+        self._completeness += result.completeness
+        self._relevance += result.relevance
+        self._coherence += result.coherence
+        self._overall += result.overall_score
+        if result.faithfulness_score is not None:
+            self._faithfulness_sum += result.faithfulness_score
+            self._faithfulness_count += 1
 
     def aggregate(self) -> Dict[str, float]:
         """Calculate mean metrics across all results.
@@ -49,29 +93,25 @@ class GenerationMetricsAggregator:
         Returns:
             Dictionary of aggregated metrics
         """
-        if not self.results:
+        if not self._n:
             return {}
 
-        n = len(self.results)
-
+        n = self._n
         metrics = {
-            "mean_correctness": sum(r.correctness for r in self.results) / n,
-            "mean_completeness": sum(r.completeness for r in self.results) / n,
-            "mean_relevance": sum(r.relevance for r in self.results) / n,
-            "mean_coherence": sum(r.coherence for r in self.results) / n,
-            "mean_overall_score": sum(r.overall_score for r in self.results) / n,
+            "mean_correctness": self._correctness / n,
+            "mean_completeness": self._completeness / n,
+            "mean_relevance": self._relevance / n,
+            "mean_coherence": self._coherence / n,
+            "mean_overall_score": self._overall / n,
         }
 
         # Calculate faithfulness if available
-        faithfulness_results = [
-            r.faithfulness_score for r in self.results if r.faithfulness_score is not None
-        ]
-        if faithfulness_results:
-            metrics["mean_faithfulness"] = sum(faithfulness_results) / len(
-                faithfulness_results
+        if self._faithfulness_count:
+            metrics["mean_faithfulness"] = (
+                self._faithfulness_sum / self._faithfulness_count
             )
 
         return metrics
 
     def __len__(self) -> int:
-        return len(self.results)
+        return self._n
@@ -2,8 +2,10 @@
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+from .._compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class RetrievalEvalResult:
     """Result from retrieval evaluation for a single query."""
 
@@ -57,25 +59,28 @@ def calculate_retrieval_metrics(
             mrr=0.0,
         )
 
-    retrieved_set: Set[Tuple[int, int]] = set(retrieved_pages)
     expected_set: Set[Tuple[int, int]] = set(expected_pages)
 
+    # One pass over the ranking collects the distinct hits and the rank of
+    # the first relevant result
+    hits: Set[Tuple[int, int]] = set()
+    mrr = 0.0
+    for rank, page in enumerate(retrieved_pages, start=1):
+        if page in expected_set:
+            if not hits:
+                mrr = 1.0 / rank
+            hits.add(page)
+    n_hits = len(hits)
+
     # Hit: did we retrieve at least one expected page?
-    hits = retrieved_set & expected_set
-    hit = len(hits) > 0
+    hit = n_hits > 0
 
     # Recall: proportion of expected pages that were retrieved
-    recall = len(hits) / len(expected_set) if expected_set else 0.0
+    recall = n_hits / len(expected_set)
 
-    # Precision: proportion of retrieved pages that are relevant
-    precision = len(hits) / len(retrieved_set) if retrieved_set else 0.0
-
-    # MRR: reciprocal rank of first relevant result
-    mrr = 0.0
-    for rank, page in enumerate(retrieved_pages, start=1):
-        if page in expected_set:
-            mrr = 1.0 / rank
-            break
+    # Precision: proportion of retrieved pages that are relevant; search
+    # results hold each page at most once, so no dedup is needed here
+    precision = n_hits / len(retrieved_pages) if retrieved_pages else 0.0
 
     return RetrievalEvalResult(
         retrieved_pages=retrieved_pages,
@@ -88,14 +93,38 @@ def calculate_retrieval_metrics(
 
 
 class RetrievalMetricsAggregator:
-    """Aggregates retrieval metrics across test cases."""
+    """Aggregates retrieval metrics across test cases.
+
+    Running sums are updated in add_result(), so aggregate() is O(1).
+    """
+
+    def __init__(self, keep_individual: bool = True):
+        """Initialize the aggregator.
 
-    def __init__(self):
+        Args:
+            keep_individual: Whether to retain each result in self.results
+        """
+        self.keep_individual = keep_individual
         self.results: List[RetrievalEvalResult] = []
+        self._total = 0
+        # Sums over results that have expected pages (ground truth)
+        self._n = 0
+        self._hits = 0
+        self._recall = 0.0
+        self._precision = 0.0
+        self._mrr = 0.0
 
     def add_result(self, result: RetrievalEvalResult) -> None:
         """Add a single evaluation result."""
-        self.results.append(result)
+        if self.keep_individual:
+            self.results.append(result)
+        self._total += 1
+        if result.expected_pages:
+            self._n += 1
+            self._hits += int(result.hit)
+            self._recall += result.recall
+            self._precision += result.precision
+            self._mrr += result.mrr
 
     def aggregate(self) -> Dict[str, float]:
         """Calculate mean metrics across all results.
@@ -103,13 +132,11 @@ class RetrievalMetricsAggregator:
         Returns:
             Dictionary of aggregated metrics
         """
-        if not self.results:
+        if not self._total:
             return {}
 
         # Only include results that have expected pages (ground truth)
-        valid_results = [r for r in self.results if r.expected_pages]
-
-        if not valid_results:
+        if not self._n:
             return {
                 "hit_rate": 0.0,
                 "mean_recall": 0.0,
@@ -118,16 +145,14 @@ class RetrievalMetricsAggregator:
                 "retrieval_coverage": 0.0,
             }
 
-        n = len(valid_results)
-        total = len(self.results)
-
+        n = self._n
         return {
-            "hit_rate": sum(1 for r in valid_results if r.hit) / n,
-            "mean_recall": sum(r.recall for r in valid_results) / n,
-            "mean_precision": sum(r.precision for r in valid_results) / n,
-            "mean_mrr": sum(r.mrr for r in valid_results) / n,
-            "retrieval_coverage": n / total if total > 0 else 0.0,
+            "hit_rate": self._hits / n,
+            "mean_recall": self._recall / n,
+            "mean_precision": self._precision / n,
+            "mean_mrr": self._mrr / n,
+            "retrieval_coverage": n / self._total,
         }
 
     def __len__(self) -> int:
-        return len(self.results)
+        return self._total
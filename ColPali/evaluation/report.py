@@ -1,8 +1,9 @@
 """Report generation utilities."""
 import csv
-import json
 import os
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator, Tuple
+
+from . import _json
 
 if TYPE_CHECKING:
     from .evaluator import EvaluationReport
@@ -18,179 +19,152 @@ class ReportGenerator:
             report: Evaluation report to generate output from
         """
         self.report = report
+        # Whether any result carries retrieval metrics; decides the table
+        # layout of both to_markdown() and to_csv()
+        self._has_retrieval = any(
+            r.retrieval_metrics for r in report.individual_results
+        )
 
     def to_json(self, path: str) -> None:
         """Save full report as JSON.
 
+        Individual results are serialized and written one at a time, so
+        the whole report is never materialized as a single dict. Each result
+        is written as one compact line inside the individual_results array.
+
         Args:
             path: Output file path
         """
-        individual_results = []
-        for r in self.report.individual_results:
-            result_data = {
-                "test_case_id": r.test_case_id,
-                "question": r.question,
-                "generated_answer": r.generated_answer,
-                "expected_answer": r.expected_answer,
-                "generation_metrics": r.generation_metrics,
-                "latency_ms": r.latency_ms,
-                "metadata": r.metadata,
-            }
-            if r.retrieval_metrics:
-                result_data["retrieval_metrics"] = r.retrieval_metrics
-            individual_results.append(result_data)
-
-        data = {
+        header = {
             "dataset_name": self.report.dataset_name,
             "total_test_cases": self.report.total_test_cases,
             "timestamp": self.report.timestamp,
             "aggregate_generation_metrics": self.report.aggregate_generation_metrics,
             "aggregate_retrieval_metrics": self.report.aggregate_retrieval_metrics,
             "evaluation_config": self.report.evaluation_config,
-            "individual_results": individual_results,
         }
 
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {_json.dumps(key)}: {_json.dumps(value)},\n")
+
+            f.write('  "individual_results": [')
+            separator = "\n    "
+            for r in self.report.individual_results:
+                result_data = {
+                    "test_case_id": r.test_case_id,
+                    "question": r.question,
+                    "generated_answer": r.generated_answer,
+                    "expected_answer": r.expected_answer,
+                    "generation_metrics": r.generation_metrics,
+                    "latency_ms": r.latency_ms,
+                    "judge_latency_ms": r.judge_latency_ms,
+                    "metadata": r.metadata,
+                }
+                if r.retrieval_metrics:
+                    result_data["retrieval_metrics"] = r.retrieval_metrics
+                f.write(separator)
+                f.write(_json.dumps(result_data))
+                separator = ",\n    "
+            f.write("\n  ]\n}\n")
 
     def to_markdown(self, path: str) -> None:
         """Generate human-readable markdown report.
 
+        Sections are written straight to the file as they are formatted.
+
         Args:
             path: Output file path
         """
-        lines = [
-            f"# Evaluation Report: {self.report.dataset_name}",
-            "",
-            f"**Generated:** {self.report.timestamp}",
-            f"**Total Test Cases:** {self.report.total_test_cases}",
-            "",
-            "## Aggregate Generation Metrics",
-            "",
-            "| Metric | Value |",
-            "|--------|-------|",
-        ]
-
-        for metric, value in self.report.aggregate_generation_metrics.items():
-            lines.append(f"| {metric} | {value:.4f} |")
-
-        # Add retrieval metrics if available
-        if self.report.aggregate_retrieval_metrics:
-            lines.extend(
-                [
-                    "",
-                    "## Aggregate Retrieval Metrics",
-                    "",
-                    "| Metric | Value |",
-                    "|--------|-------|",
-                ]
-            )
-            for metric, value in self.report.aggregate_retrieval_metrics.items():
-                lines.append(f"| {metric} | {value:.4f} |")
-
-        # Check if any results have retrieval metrics
-        has_retrieval = any(
-            r.retrieval_metrics for r in self.report.individual_results
-        )
-
-        if has_retrieval:
-            lines.extend(
-                [
-                    "",
-                    "## Individual Results Summary",
-                    "",
-                    "| Test Case | Overall Score | Correctness | Completeness | Hit | Recall | MRR | Latency (ms) |",
-                    "|-----------|---------------|-------------|--------------|-----|--------|-----|--------------|",
-                ]
-            )
-        else:
-            lines.extend(
-                [
-                    "",
-                    "## Individual Results Summary",
-                    "",
-                    "| Test Case | Overall Score | Correctness | Completeness | Latency (ms) |",
-                    "|-----------|---------------|-------------|--------------|--------------|",
-                ]
-            )
-
-        for r in self.report.individual_results:
-            gm = r.generation_metrics
-            if has_retrieval:
-                rm = r.retrieval_metrics or {}
-                hit = "✓" if rm.get("hit") else "✗" if rm else "-"
-                recall = f"{rm.get('recall', 0):.2f}" if rm else "-"
-                mrr = f"{rm.get('mrr', 0):.2f}" if rm else "-"
-                lines.append(
-                    f"| {r.test_case_id} | {gm.get('overall_score', 'N/A')} | "
-                    f"{gm.get('correctness', 'N/A')} | {gm.get('completeness', 'N/A')} | "
-                    f"{hit} | {recall} | {mrr} | {r.latency_ms:.1f} |"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            write = f.write
+
+            write(f"# Evaluation Report: {self.report.dataset_name}\n\n")
+            write(f"**Generated:** {self.report.timestamp}\n")
+            write(f"**Total Test Cases:** {self.report.total_test_cases}\n\n")
+            write("## Aggregate Generation Metrics\n\n")
+            write("| Metric | Value |\n")
+            write("|--------|-------|\n")
+
+            for metric, value in self.report.aggregate_generation_metrics.items():
+                write(f"| {metric} | {value:.4f} |\n")
+
+            # Add retrieval metrics if available
+            if self.report.aggregate_retrieval_metrics:
+                write("\n## Aggregate Retrieval Metrics\n\n")
+                write("| Metric | Value |\n")
+                write("|--------|-------|\n")
+                for metric, value in self.report.aggregate_retrieval_metrics.items():
+                    write(f"| {metric} | {value:.4f} |\n")
+
+            write("\n## Individual Results Summary\n\n")
+            if self._has_retrieval:
+                write(
+                    "| Test Case | Overall Score | Correctness | Completeness | Hit | Recall | MRR | Latency (ms) |\n"
+                    "|-----------|---------------|-------------|--------------|-----|--------|-----|--------------|\n"
                 )
+                for r in self.report.individual_results:
+                    gm = r.generation_metrics
+                    rm = r.retrieval_metrics
+                    if rm:
+                        hit = "✓" if rm.get("hit") else "✗"
+                        recall = f"{rm.get('recall', 0):.2f}"
+                        mrr = f"{rm.get('mrr', 0):.2f}"
+                    else:
+                        hit = recall = mrr = "-"
+                    write(
+                        f"| {r.test_case_id} | {gm.get('overall_score', 'N/A')} | "
+                        f"{gm.get('correctness', 'N/A')} | {gm.get('completeness', 'N/A')} | "
+                        f"{hit} | {recall} | {mrr} | {r.latency_ms:.1f} |\n"
+                    )
             else:
-                lines.append(
-                    f"| {r.test_case_id} | {gm.get('overall_score', 'N/A')} | "
-                    f"{gm.get('correctness', 'N/A')} | {gm.get('completeness', 'N/A')} | "
-                    f"{r.latency_ms:.1f} |"
+                write(
+                    "| Test Case | Overall Score | Correctness | Completeness | Latency (ms) |\n"
+                    "|-----------|---------------|-------------|--------------|--------------|\n"
                 )
+                for r in self.report.individual_results:
+                    gm = r.generation_metrics
+                    write(
+                        f"| {r.test_case_id} | {gm.get('overall_score', 'N/A')} | "
+                        f"{gm.get('correctness', 'N/A')} | {gm.get('completeness', 'N/A')} | "
+                        f"{r.latency_ms:.1f} |\n"
+                    )
 
-        lines.extend(
-            [
-                "",
-                "## Detailed Results",
-                "",
-            ]
-        )
-
-        for r in self.report.individual_results:
-            lines.extend(
-                [
-                    f"### {r.test_case_id}",
-                    "",
-                    f"**Question:** {r.question}",
-                    "",
-                    f"**Expected Answer:** {r.expected_answer}",
-                    "",
-                    f"**Generated Answer:** {r.generated_answer}",
-                    "",
-                ]
-            )
+            write("\n## Detailed Results\n")
 
-            # Add retrieval info if available
-            if r.retrieval_metrics:
-                rm = r.retrieval_metrics
-                retrieved = ", ".join(
-                    f"({p['doc_id']}, {p['page_num']})"
-                    for p in rm.get("retrieved_pages", [])
-                )
-                expected = ", ".join(
-                    f"({p['doc_id']}, {p['page_num']})"
-                    for p in rm.get("expected_pages", [])
-                )
-                hit_status = "✓ Hit" if rm.get("hit") else "✗ Miss"
-                lines.extend(
-                    [
-                        f"**Retrieval:** {hit_status} | Recall: {rm.get('recall', 0):.2f} | MRR: {rm.get('mrr', 0):.2f}",
-                        "",
-                        f"**Retrieved Pages:** {retrieved or 'None'}",
-                        "",
-                        f"**Expected Pages:** {expected or 'None'}",
-                        "",
-                    ]
+            for r in self.report.individual_results:
+                write(
+                    f"\n### {r.test_case_id}\n\n"
+                    f"**Question:** {r.question}\n\n"
+                    f"**Expected Answer:** {r.expected_answer}\n\n"
+                    f"**Generated Answer:** {r.generated_answer}\n"
                 )
 
-            lines.extend(
-                [
-                    f"**Reasoning:** {r.generation_metrics.get('reasoning', 'N/A')}",
-                    "",
-                    "---",
-                    "",
-                ]
-            )
-
-        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+                # Add retrieval info if available
+                if r.retrieval_metrics:
+                    rm = r.retrieval_metrics
+                    retrieved = ", ".join(
+                        f"({p['doc_id']}, {p['page_num']})"
+                        for p in rm.get("retrieved_pages", [])
+                    )
+                    expected = ", ".join(
+                        f"({p['doc_id']}, {p['page_num']})"
+                        for p in rm.get("expected_pages", [])
+                    )
+                    hit_status = "✓ Hit" if rm.get("hit") else "✗ Miss"
+                    write(
+                        f"\n**Retrieval:** {hit_status} | Recall: {rm.get('recall', 0):.2f} | MRR: {rm.get('mrr', 0):.2f}\n\n"
+                        f"**Retrieved Pages:** {retrieved or 'None'}\n\n"
+                        f"**Expected Pages:** {expected or 'None'}\n"
+                    )
+
+                write(
+                    f"\n**Reasoning:** {r.generation_metrics.get('reasoning', 'N/A')}\n\n"
+                    "---\n"
+                )
 
     def to_csv(self, path: str) -> None:
         """Export metrics to CSV for analysis.
@@ -200,11 +174,6 @@ class ReportGenerator:
         """
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
 
-        # Check if any results have retrieval metrics
-        has_retrieval = any(
-            r.retrieval_metrics for r in self.report.individual_results
-        )
-
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
 
@@ -219,32 +188,41 @@ class ReportGenerator:
                 "coherence",
                 "overall_score",
             ]
-            if has_retrieval:
+            if self._has_retrieval:
                 headers.extend(["hit", "recall", "precision", "mrr"])
             writer.writerow(headers)
 
-            # Data rows
-            for r in self.report.individual_results:
-                gm = r.generation_metrics
-                row = [
-                    r.test_case_id,
-                    r.question[:100],  # Truncate long questions
-                    f"{r.latency_ms:.1f}",
-                    gm.get("correctness", ""),
-                    gm.get("completeness", ""),
-                    gm.get("relevance", ""),
-                    gm.get("coherence", ""),
-                    gm.get("overall_score", ""),
-                ]
-                if has_retrieval:
-                    rm = r.retrieval_metrics or {}
-                    row.extend([
-                        rm.get("hit", ""),
-                        rm.get("recall", ""),
-                        rm.get("precision", ""),
-                        rm.get("mrr", ""),
-                    ])
-                writer.writerow(row)
+            # Data rows; writerows() drives the generator from C
+            writer.writerows(self._csv_rows())
+
+    def _csv_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Yield one to_csv() data row per individual result."""
+        for r in self.report.individual_results:
+            gm = r.generation_metrics
+            row = (
+                r.test_case_id,
+                r.question[:100],  # Truncate long questions
+                f"{r.latency_ms:.1f}",
+                gm.get("correctness", ""),
+                gm.get("completeness", ""),
+                gm.get("relevance", ""),
+                gm.get("coherence", ""),
+                gm.get("overall_score", ""),
+            )
+            if not self._has_retrieval:
+                yield row
+                continue
+
+            rm = r.retrieval_metrics
+            if rm:
+                yield row + (
+                    rm.get("hit", ""),
+                    rm.get("recall", ""),
+                    rm.get("precision", ""),
+                    rm.get("mrr", ""),
+                )
+            else:
+                yield row + ("", "", "", "")
 
     def save_all(self, output_dir: str) -> None:
         """Save all report formats to output directory.
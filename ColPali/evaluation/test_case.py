@@ -1,10 +1,21 @@
 """Test case data structures for evaluation."""
+import os
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Tuple, Optional
-import json
 
+from . import _json
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional, only for huge datasets
+    ijson = None
+
+# Datasets larger than this are parsed incrementally when ijson is available
+_STREAM_THRESHOLD_BYTES = 64 << 20
+
+
+@dataclass(**DATACLASS_SLOTS)
 class TestCase:
     """Single evaluation test case."""
 
@@ -17,7 +28,7 @@ class TestCase:
     expected_pages: Optional[List[Tuple[int, int]]] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TestDataset:
     """Collection of test cases."""
 
@@ -30,41 +41,59 @@ class TestDataset:
     def from_json(cls, path: str) -> "TestDataset":
         """Load dataset from JSON file.
 
+        Files over 64 MiB are parsed incrementally with ijson, when it is
+        installed, so only one raw test case is held at a time.
+
         Args:
             path: Path to JSON file
 
         Returns:
             TestDataset instance
         """
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if ijson is not None and os.path.getsize(path) > _STREAM_THRESHOLD_BYTES:
+            return cls._from_json_stream(path)
 
-        test_cases = []
-        for tc in data["test_cases"]:
-            # Parse expected_pages if present
-            expected_pages = None
-            if "expected_pages" in tc and tc["expected_pages"]:
-                expected_pages = [
-                    (p["doc_id"], p["page_num"]) for p in tc["expected_pages"]
-                ]
-
-            test_cases.append(
-                TestCase(
-                    id=tc["id"],
-                    question=tc["question"],
-                    expected_answer=tc["expected_answer"],
-                    metadata=tc.get("metadata", {}),
-                    expected_pages=expected_pages,
-                )
-            )
+        with open(path, "rb") as f:
+            data = _json.loads(f.read())
 
         return cls(
             version=data.get("version", "1.0"),
             dataset_name=data.get("dataset_name", "Unnamed"),
-            test_cases=test_cases,
+            test_cases=[_parse_test_case(tc) for tc in data["test_cases"]],
             description=data.get("description", ""),
         )
 
+    @classmethod
+    def _from_json_stream(cls, path: str) -> "TestDataset":
+        """Load a dataset with ijson; see from_json()."""
+        header = {}
+        test_cases = []
+        builder = None
+        with open(path, "rb") as f:
+            # One pass: top-level scalars are picked up wherever they appear,
+            # and each test case is built from its events as it streams by
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == "test_cases.item" and event == "end_map":
+                        test_cases.append(_parse_test_case(builder.value))
+                        builder = None
+                elif prefix == "test_cases.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix in ("version", "dataset_name", "description") and event in (
+                    "string",
+                    "number",
+                ):
+                    header[prefix] = str(value)
+
+        return cls(
+            version=header.get("version", "1.0"),
+            dataset_name=header.get("dataset_name", "Unnamed"),
+            test_cases=test_cases,
+            description=header.get("description", ""),
+        )
+
     def to_json(self, path: str) -> None:
         """Save dataset to JSON file.
 
@@ -93,11 +122,27 @@ class TestDataset:
                 ]
             data["test_cases"].append(tc_data)
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(path, "wb") as f:
+            f.write(_json.dumps_indented(data))
 
     def __len__(self) -> int:
         return len(self.test_cases)
 
     def __iter__(self):
         return iter(self.test_cases)
+
+
+def _parse_test_case(tc: Dict[str, Any]) -> TestCase:
+    """Build a TestCase from its JSON object."""
+    # Parse expected_pages if present
+    expected_pages = None
+    if "expected_pages" in tc and tc["expected_pages"]:
+        expected_pages = [(p["doc_id"], p["page_num"]) for p in tc["expected_pages"]]
+
+    return TestCase(
+        id=tc["id"],
+        question=tc["question"],
+        expected_answer=tc["expected_answer"],
+        metadata=tc.get("metadata", {}),
+        expected_pages=expected_pages,
+    )
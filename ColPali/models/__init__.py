@@ -1,13 +1,38 @@
-"""Models module for ML model management."""
-from .loader import ModelLoader, ModelLoadError
-from .colpali_embedder import ColPaliEmbedder
-from .retrieval_model import RetrievalModel
-from .vision_model import VisionLanguageModel
-
-__all__ = [
-    "ModelLoader",
-    "ModelLoadError",
-    "ColPaliEmbedder",
-    "RetrievalModel",
-    "VisionLanguageModel",
-]
+"""Models module for ML model management.
+
+Submodules pull in torch and transformers, so the public names are
+imported lazily on first attribute access (PEP 562).
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .loader import ModelLoader, ModelLoadError
+    from .colpali_embedder import ColPaliEmbedder
+    from .kv_cache import PrefixKVCache
+    from .retrieval_model import RetrievalModel
+    from .vision_model import VisionLanguageModel
+
+_EXPORTS = {
+    "ModelLoader": ".loader",
+    "ModelLoadError": ".loader",
+    "ColPaliEmbedder": ".colpali_embedder",
+    "PrefixKVCache": ".kv_cache",
+    "RetrievalModel": ".retrieval_model",
+    "VisionLanguageModel": ".vision_model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
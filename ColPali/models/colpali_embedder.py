@@ -1,4 +1,5 @@
 """Direct ColPali embedding extraction."""
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, TYPE_CHECKING
 
 import torch
@@ -25,27 +26,52 @@ class ColPaliEmbedder:
         self._model = model
         self._processor = processor
         self._device = next(model.parameters()).device
+        # Resolved once; _to_device() runs for every batch
+        self._pin_memory = self._device.type == "cuda"
+        self._to_kwargs = {"device": self._device, "non_blocking": self._pin_memory}
 
-    def embed_images(self, images: List[Image.Image]) -> List[torch.Tensor]:
+    def embed_images(
+        self, images: List[Image.Image], batch_size: int = 8
+    ) -> List[torch.Tensor]:
         """Generate multi-vector embeddings for images.
 
+        Images are embedded in mini-batches so long lists don't run the GPU
+        out of memory.
+
         Args:
             images: List of PIL images
+            batch_size: Number of images per forward pass
 
         Returns:
             List of embedding tensors, each shape (num_patches, embedding_dim)
         """
-        if not images:
+        chunks = [
+            images[start : start + batch_size]
+            for start in range(0, len(images), batch_size)
+        ]
+        if not chunks:
             return []
-
-        # Process images in batch
-        batch = self._processor.process_images(images).to(self._device)
-
-        with torch.no_grad():
-            embeddings = self._model(**batch)
-
-        # Return list of individual embeddings
-        return [emb for emb in embeddings]
+        if len(chunks) == 1:
+            batch = self._to_device(self._processor.process_images(chunks[0]))
+            with torch.inference_mode():
+                return list(torch.unbind(self._model(**batch)))
+
+        embeddings: List[torch.Tensor] = []
+        # Preprocess chunk i+1 on a worker thread while chunk i runs on the
+        # device; the processor is CPU-bound and releases the GIL in PIL
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._processor.process_images, chunks[0])
+            for i in range(len(chunks)):
+                batch = self._to_device(pending.result())
+                if i + 1 < len(chunks):
+                    pending = executor.submit(
+                        self._processor.process_images, chunks[i + 1]
+                    )
+
+                with torch.inference_mode():
+                    embeddings.extend(torch.unbind(self._model(**batch)))
+
+        return embeddings
 
     def embed_query(self, query: str) -> torch.Tensor:
         """Generate multi-vector embedding for a text query.
@@ -56,28 +82,44 @@ class ColPaliEmbedder:
         Returns:
             Embedding tensor of shape (num_tokens, embedding_dim)
         """
-        batch = self._processor.process_queries([query]).to(self._device)
+        batch = self._to_device(self._processor.process_queries([query]))
 
-        with torch.no_grad():
+        with torch.inference_mode():
             embeddings = self._model(**batch)
 
         return embeddings[0]
 
-    def embed_queries(self, queries: List[str]) -> List[torch.Tensor]:
+    def embed_queries(
+        self, queries: List[str], batch_size: int = 8
+    ) -> List[torch.Tensor]:
         """Generate multi-vector embeddings for multiple text queries.
 
         Args:
             queries: List of query strings
+            batch_size: Number of queries per forward pass
 
         Returns:
             List of embedding tensors, each shape (num_tokens, embedding_dim)
         """
-        if not queries:
-            return []
+        embeddings: List[torch.Tensor] = []
+        for start in range(0, len(queries), batch_size):
+            batch = self._to_device(
+                self._processor.process_queries(queries[start : start + batch_size])
+            )
 
-        batch = self._processor.process_queries(queries).to(self._device)
+            with torch.inference_mode():
+                embeddings.extend(torch.unbind(self._model(**batch)))
 
-        with torch.no_grad():
-            embeddings = self._model(**batch)
+        return embeddings
 
-        return [emb for emb in embeddings]
+    def _to_device(self, batch):
+        """Move a processor batch to the model device.
+
+        On CUDA the tensors are pinned first so the copy is an async DMA
+        that overlaps with work already queued on the stream.
+        """
+        if self._pin_memory:
+            for key, value in batch.items():
+                if isinstance(value, torch.Tensor):
+                    batch[key] = value.pin_memory()
+        return batch.to(**self._to_kwargs)
@@ -0,0 +1,39 @@
+"""Compute device and weight dtype selection.
+
+The backend is probed once per process; every loader and model wrapper
+reads the cached answer instead of querying the CUDA runtime again.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+
+@lru_cache(maxsize=1)
+def _detect() -> Tuple[str, "torch.dtype"]:
+    import torch
+
+    if torch.cuda.is_available():
+        # BF16 tensor cores only exist from Ampere (sm_80) on; older GPUs
+        # emulate BF16, so they get FP16 instead
+        major, _ = torch.cuda.get_device_capability()
+        return "cuda", torch.bfloat16 if major >= 8 else torch.float16
+
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        # MPS has no BF16 support
+        return "mps", torch.float16
+
+    # Half-precision matmuls on CPU are mostly emulated and slower than FP32
+    return "cpu", torch.float32
+
+
+def get_device() -> str:
+    """Return the compute device name: "cuda", "mps" or "cpu"."""
+    return _detect()[0]
+
+
+def get_dtype() -> "torch.dtype":
+    """Return the model weight dtype suited to get_device()."""
+    return _detect()[1]
@@ -0,0 +1,105 @@
+"""Prefix KV-cache storage for the vision-language model.
+
+Caches the attention key/value states produced by prefilling the image
+portion of a prompt, so repeat queries over the same retrieved pages only
+need to prefill the question tokens.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import torch
+from PIL import Image
+
+
+class PrefixKVCache:
+    """Disk-backed cache of VL prefill states keyed by context images.
+
+    Entries are keyed by a hash of the model name and the raw bytes of the
+    ordered context images, so re-indexing changed documents (or switching
+    models) never reuses stale states. Independently prefilled pages cannot
+    be concatenated (positional encodings would collide), so each entry
+    covers one ordered page set.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        max_memory_entries: int = 2,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for serialized cache entries
+            model_name: VL model name, mixed into every key
+            max_memory_entries: Number of entries kept in host memory
+        """
+        self._cache_dir = cache_dir
+        self._model_name = model_name
+        self._max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def make_key(self, images: List[Image.Image]) -> str:
+        """Build a cache key for an ordered list of context images.
+
+        Args:
+            images: Context images in prompt order
+
+        Returns:
+            Hex digest identifying the model and image contents
+        """
+        digest = hashlib.sha1(self._model_name.encode("utf-8"))
+        for image in images:
+            digest.update(f"{image.mode}:{image.size}".encode("utf-8"))
+            digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(
+        self, key: str, map_location: Optional[torch.device] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Look up a cache entry in memory, then on disk.
+
+        Args:
+            key: Key from make_key()
+            map_location: Device to load tensors onto
+
+        Returns:
+            Cache entry, or None on miss
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        entry = torch.load(path, map_location=map_location, weights_only=False)
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store a cache entry in memory and on disk.
+
+        Args:
+            key: Key from make_key()
+            entry: Dict with 'past_key_values', 'rope_deltas' and 'prefix_len'
+        """
+        os.makedirs(self._cache_dir, exist_ok=True)
+        torch.save(entry, self._path(key))
+        self._remember(key, entry)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or os.path.exists(self._path(key))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.pt")
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
@@ -1,11 +1,12 @@
 """Model loading utilities with lazy loading support."""
-from typing import TYPE_CHECKING, Tuple
+from typing import Any, Optional, TYPE_CHECKING, Tuple
 
 if TYPE_CHECKING:
     from colpali_engine.models import ColPali, ColPaliProcessor
     from transformers import Qwen3VLForConditionalGeneration, Qwen3VLProcessor
 
 from config import ModelConfig
+from models.device import get_device, get_dtype
 
 
 class ModelLoadError(Exception):
@@ -38,7 +39,7 @@ class ModelLoader:
                 "Install it with: pip install colpali-engine"
             ) from e
 
-        dtype = torch.bfloat16 if hasattr(torch, "bfloat16") else torch.float16
+        dtype = get_dtype()
 
         model = ColPali.from_pretrained(
             self.config.retrieval_model_name,
@@ -46,6 +47,13 @@ class ModelLoader:
             device_map="auto",
         ).eval()
 
+        if self.config.compile_retrieval_model and get_device() == "cuda":
+            # Default mode, not "reduce-overhead": CUDA-graph outputs are
+            # overwritten by the next replay, while indexing keeps earlier
+            # batches' embeddings alive (upload thread, embedding cache).
+            # New shapes (last batch, queries) compile on first use.
+            model = torch.compile(model)
+
         processor = ColPaliProcessor.from_pretrained(
             self.config.retrieval_model_name
         )
@@ -70,17 +78,108 @@ class ModelLoader:
                 "Install with: pip install transformers torch"
             ) from e
 
-        dtype = torch.bfloat16 if hasattr(torch, "bfloat16") else torch.float16
-        model = Qwen3VLForConditionalGeneration.from_pretrained(
-            self.config.vl_model_name,
-            torch_dtype=dtype,
-        )
-
-        if torch.cuda.is_available():
-            model.cuda().eval()
+        device = get_device()
+        load_kwargs = {"torch_dtype": get_dtype()}
+        quantization_config = self._vl_quantization_config()
+        if quantization_config is not None:
+            # Quantized weights are placed by accelerate, not moved afterwards
+            load_kwargs["quantization_config"] = quantization_config
+            load_kwargs["device_map"] = "auto"
+
+        # FlashAttention-2 needs CUDA and the flash_attn package; fall back
+        # to PyTorch SDPA when either is missing
+        model = None
+        if device == "cuda":
+            try:
+                model = Qwen3VLForConditionalGeneration.from_pretrained(
+                    self.config.vl_model_name,
+                    attn_implementation="flash_attention_2",
+                    **load_kwargs,
+                )
+            except (ImportError, ValueError):
+                model = None
+
+        if model is None:
+            model = Qwen3VLForConditionalGeneration.from_pretrained(
+                self.config.vl_model_name,
+                attn_implementation="sdpa",
+                **load_kwargs,
+            )
+
+        # Move to the accelerator once at load time; generation never
+        # re-uploads
+        if quantization_config is None and device != "cpu":
+            model.to(device)
+        model.eval()
+
+        if (
+            self.config.compile_vl_model
+            and quantization_config is None
+            and device == "cuda"
+            and torch.cuda.get_device_capability()[0] >= 7
+        ):
+            # Compile forward() only: generate() stays an ordinary method and
+            # every decoding step runs the fused graph. No CUDA graphs
+            # ("reduce-overhead"): their outputs are overwritten by the next
+            # replay, while generate() keeps each step's logits and KV cache.
+            model.forward = torch.compile(model.forward)
 
         return model
 
+    def _vl_quantization_config(self) -> Optional[Any]:
+        """Build the weight-only quantization config for the VL model.
+
+        Returns:
+            transformers quantization config, or None when disabled or when
+            no GPU is available (both backends require CUDA)
+
+        Raises:
+            ModelLoadError: If the backend is missing or the mode is unknown
+        """
+        quantization = self.config.quantization
+        if quantization == "none" or get_device() != "cuda":
+            return None
+
+        if quantization in ("int8", "nf4"):
+            return self._bitsandbytes_config(quantization)
+
+        if quantization == "fp8":
+            try:
+                from transformers import TorchAoConfig
+                import torchao  # noqa: F401
+            except ImportError as e:
+                raise ModelLoadError(
+                    "fp8 quantization requires torchao. "
+                    "Install with: pip install torchao"
+                ) from e
+            return TorchAoConfig("float8_weight_only")
+
+        raise ModelLoadError(f"Unknown VL quantization: {quantization}")
+
+    @staticmethod
+    def _bitsandbytes_config(quantization: str) -> Any:
+        """Build the bitsandbytes config for "int8" or "nf4" VL weights.
+
+        Raises:
+            ModelLoadError: If bitsandbytes is not installed
+        """
+        try:
+            from transformers import BitsAndBytesConfig
+            import bitsandbytes  # noqa: F401
+        except ImportError as e:
+            raise ModelLoadError(
+                f"{quantization} quantization requires bitsandbytes. "
+                "Install with: pip install bitsandbytes"
+            ) from e
+
+        if quantization == "int8":
+            return BitsAndBytesConfig(load_in_8bit=True, llm_int8_threshold=6.0)
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=get_dtype(),
+        )
+
     def load_vl_processor(self) -> "Qwen3VLProcessor":
         """Load the Qwen3 VL processor.
 
@@ -88,7 +187,8 @@ class ModelLoader:
             Loaded processor
 
         Raises:
-            ModelLoadError: If import or loading fails
+            ModelLoadError: If import or loading fails, or the fast tokenizer
+                was requested but could not be loaded
         """
         try:
             from transformers import Qwen3VLProcessor
@@ -97,9 +197,21 @@ class ModelLoader:
                 "Failed to import Qwen3VLProcessor from transformers."
             ) from e
 
-        return Qwen3VLProcessor.from_pretrained(
+        processor = Qwen3VLProcessor.from_pretrained(
             self.config.vl_model_name,
             use_fast=self.config.use_fast_processor,
             min_pixels=self.config.min_pixels,
             max_pixels=self.config.max_pixels,
         )
+
+        # transformers silently falls back to the slow tokenizer; fail loudly
+        # instead of running every prompt through the Python path
+        if self.config.use_fast_processor and not getattr(
+            processor.tokenizer, "is_fast", False
+        ):
+            raise ModelLoadError(
+                "Fast tokenizer unavailable for "
+                f"{self.config.vl_model_name}. Install with: pip install tokenizers"
+            )
+
+        return processor
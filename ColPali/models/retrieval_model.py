@@ -3,11 +3,26 @@
 Provides document indexing and retrieval using ColPali embeddings
 stored in Qdrant vector database.
 """
-from typing import Any, Dict, List, TYPE_CHECKING
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 
 from PIL import Image
 
 if TYPE_CHECKING:
+    import torch
     from models.colpali_embedder import ColPaliEmbedder
     from storage.vector_store import QdrantVectorStore
 
@@ -50,45 +65,94 @@ class RetrievalModel:
 
     def index(
         self,
-        images: Dict[int, List[Image.Image]],
+        pages: Iterable[Tuple[int, int, Union[Image.Image, "torch.Tensor"]]],
         overwrite: bool = False,
+        batch_size: int = 16,
+        on_embedded: Optional[Callable[[int, int, "torch.Tensor"], None]] = None,
     ) -> None:
-        """Index document images.
+        """Index document page images.
+
+        Pages are consumed as a stream and embedded in fixed-size batches
+        that may span documents, so each ColPali forward pass sees a full
+        batch and only batch_size pages are held in memory.
 
         Args:
-            images: Mapping of doc_id to list of page images
+            pages: Iterable of (doc_id, page_num, image) with 1-indexed
+                page numbers. A precomputed embedding may stand in for the
+                image, in which case the page skips the forward pass.
             overwrite: Whether to clear existing index first
+            batch_size: Number of pages embedded per forward pass
+            on_embedded: Optional callback receiving (doc_id, page_num,
+                embedding) for every page embedded here
         """
         if overwrite:
             self._vector_store.delete_collection()
             self._vector_store.initialize()
             self._point_counter = 0
 
-        # Process each document
-        for doc_id, pages in images.items():
-            if not pages:
-                continue
-
-            # Generate embeddings for all pages in batch
-            embeddings = self._embedder.embed_images(pages)
-
-            # Prepare batch of points
-            points = []
-            for page_idx, page_embedding in enumerate(embeddings):
-                page_num = page_idx + 1  # 1-indexed
-                points.append({
-                    "point_id": self._point_counter,
-                    "doc_id": doc_id,
-                    "page_num": page_num,
-                    "embeddings": page_embedding,
-                })
-                self._point_counter += 1
-
-            # Add to vector store in batch
-            self._vector_store.add_documents_batch(points)
+        page_iter = iter(pages)
+        # Upserts run on a background thread so Qdrant I/O overlaps the next
+        # forward pass; at most two batches are in flight at once
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            while True:
+                batch = list(islice(page_iter, batch_size))
+                if not batch:
+                    break
+
+                # Generate embeddings for all images in one forward pass
+                embeddings = [page for _, _, page in batch]
+                to_embed = [
+                    i
+                    for i, page in enumerate(embeddings)
+                    if isinstance(page, Image.Image)
+                ]
+                if to_embed:
+                    fresh = self._embedder.embed_images(
+                        [embeddings[i] for i in to_embed], batch_size=batch_size
+                    )
+                    for i, embedding in zip(to_embed, fresh):
+                        embeddings[i] = embedding
+                        if on_embedded is not None:
+                            on_embedded(batch[i][0], batch[i][1], embedding)
+
+                if len(pending) >= 2:
+                    pending.popleft().result()
+
+                # Upload ids, vectors and payloads as parallel lists
+                start = self._point_counter
+                self._point_counter += len(batch)
+                pending.append(
+                    uploader.submit(
+                        self._vector_store.add_documents_soa,
+                        ids=list(range(start, self._point_counter)),
+                        embeddings=embeddings,
+                        payloads=[
+                            {"doc_id": doc_id, "page_num": page_num}
+                            for doc_id, page_num, _ in batch
+                        ],
+                    )
+                )
+
+            # Surface any upload error before marking the index usable
+            while pending:
+                pending.popleft().result()
+
+        self._vector_store.flush()
 
         self._indexed = True
 
+    def embed_query(self, query: str) -> "torch.Tensor":
+        """Generate the multi-vector embedding for a query.
+
+        Args:
+            query: Search query text
+
+        Returns:
+            Embedding tensor of shape (num_tokens, embedding_dim)
+        """
+        return self._embedder.embed_query(query)
+
     def search(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
         """Search indexed documents.
 
@@ -99,6 +163,23 @@ class RetrievalModel:
         Returns:
             List of search results with doc_id, page_num, and score
 
+        Raises:
+            RuntimeError: If documents haven't been indexed
+        """
+        return self.search_by_embedding(self.embed_query(query), k=k)
+
+    def search_by_embedding(
+        self, query_embedding: "torch.Tensor", k: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Search indexed documents with a precomputed query embedding.
+
+        Args:
+            query_embedding: Output of embed_query()
+            k: Number of results to return
+
+        Returns:
+            List of search results with doc_id, page_num, and score
+
         Raises:
             RuntimeError: If documents haven't been indexed
         """
@@ -107,8 +188,5 @@ class RetrievalModel:
                 "Documents must be indexed before searching. Call index() first."
             )
 
-        # Generate query embedding
-        query_embedding = self._embedder.embed_query(query)
-
         # Search using MaxSim
         return self._vector_store.search(query_embedding, top_k=k)
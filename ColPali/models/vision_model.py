@@ -1,10 +1,16 @@
 """Wrapper for Qwen3 Vision-Language model."""
-from typing import List, TYPE_CHECKING
+import copy
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
 
 from PIL import Image
 
+from models.device import get_device
+
 if TYPE_CHECKING:
     from transformers import Qwen3VLForConditionalGeneration, Qwen3VLProcessor
+    from models.kv_cache import PrefixKVCache
 
 
 class VisionLanguageModel:
@@ -17,15 +23,33 @@ class VisionLanguageModel:
         self,
         model: "Qwen3VLForConditionalGeneration",
         processor: "Qwen3VLProcessor",
+        kv_cache: Optional["PrefixKVCache"] = None,
     ):
+        """Initialize the wrapper.
+
+        Args:
+            model: Loaded Qwen3-VL model
+            processor: Qwen3-VL processor
+            kv_cache: Optional prefix KV cache for the image portion of prompts
+        """
         self._model = model
         self._processor = processor
+        self._kv_cache = kv_cache
+        # generate() mutates per-call model state (rope offsets, KV cache), so
+        # concurrent requests share the preprocessing but decode one at a time
+        self._generate_lock = threading.Lock()
+        # Per-instance so cached prompts don't outlive the processor
+        self._render_prompt = lru_cache(maxsize=128)(self._render_prompt_uncached)
 
     def build_chat_template(
         self, images: List[Image.Image], text_query: str
     ) -> List[dict]:
         """Build chat template for VL model input.
 
+        Images come first and the question last, so the image portion forms
+        a static prefix that the prefix KV cache can reuse; callers pass pages
+        in canonical (doc_id, page_num) order for the same reason.
+
         Args:
             images: List of PIL images for context
             text_query: User question text
@@ -57,6 +81,124 @@ class VisionLanguageModel:
         Returns:
             List of generated text responses
 
+        Raises:
+            RuntimeError: If qwen_vl_utils is not available
+        """
+        inputs = self._prepare_inputs(images, text_query)
+        generated_ids = self._generate_ids(images, inputs, max_new_tokens)
+
+        # Prompts are padded to one length, so a single slice drops them all
+        generated_ids_trimmed = generated_ids[:, inputs.input_ids.shape[1] :]
+
+        return self._processor.batch_decode(
+            generated_ids_trimmed,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False,
+        )
+
+    def generate_stream(
+        self,
+        images: List[Image.Image],
+        text_query: str,
+        max_new_tokens: int = 200,
+    ) -> Iterator[str]:
+        """Generate a response, yielding text chunks as they are decoded.
+
+        Args:
+            images: List of PIL images for context
+            text_query: User question
+            max_new_tokens: Maximum tokens to generate
+
+        Yields:
+            Newly decoded text fragments, in order
+
+        Raises:
+            RuntimeError: If qwen_vl_utils is not available
+        """
+        from transformers import TextIteratorStreamer
+
+        inputs = self._prepare_inputs(images, text_query)
+        streamer = TextIteratorStreamer(
+            self._processor.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False,
+        )
+
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                self._generate_ids(images, inputs, max_new_tokens, streamer=streamer)
+            except BaseException as e:
+                # Unblock the consumer; the error is re-raised below
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            yield from streamer
+        finally:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def _generate_ids(
+        self, images: List[Image.Image], inputs, max_new_tokens: int, **kwargs: Any
+    ):
+        """Run model.generate() on prepared inputs and return the output ids."""
+        import torch
+
+        with self._generate_lock, torch.inference_mode():
+            generate_kwargs: Dict[str, Any] = dict(kwargs)
+            if self._kv_cache is not None and images:
+                generate_kwargs["past_key_values"] = self._cached_prefix(
+                    images, inputs
+                )
+
+            return self._model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                use_cache=True,
+                num_beams=1,
+                do_sample=False,
+                **generate_kwargs,
+            )
+
+    def warmup(self, generate: bool = False) -> None:
+        """Run the chat template and tokenizer once.
+
+        Moves their one-time setup (template compilation, tokenizer caches)
+        out of the first query.
+
+        Args:
+            generate: Also decode one token from a text-only prompt, which
+                triggers torch.compile on a compiled model
+        """
+        self._processor.tokenizer(self._render_prompt_uncached(0, "warmup"))
+        if generate:
+            self.generate([], "warmup", max_new_tokens=1)
+
+    def prefill(self, images: List[Image.Image]) -> None:
+        """Populate the prefix KV cache for images without generating.
+
+        Args:
+            images: Context images in the order they will be queried with
+        """
+        if self._kv_cache is None or not images:
+            return
+
+        key = self._kv_cache.make_key(images)
+        if key in self._kv_cache:
+            return
+
+        inputs = self._prepare_inputs(images, "")
+        self._kv_cache.put(key, self._compute_prefix(inputs))
+
+    def _prepare_inputs(self, images: List[Image.Image], text_query: str):
+        """Apply the chat template and run the processor.
+
         Raises:
             RuntimeError: If qwen_vl_utils is not available
         """
@@ -69,29 +211,95 @@ class VisionLanguageModel:
                 "Install with: pip install qwen_vl_utils"
             ) from e
 
+        # Hand the processor RGB images so it skips per-image mode handling
+        images = [
+            image if image.mode == "RGB" else image.convert("RGB") for image in images
+        ]
         chat_template = self.build_chat_template(images, text_query)
 
-        text = self._processor.apply_chat_template(
-            chat_template, tokenize=False, add_generation_prompt=True
-        )
+        text = self._render_prompt(len(images), text_query)
         image_inputs, _ = process_vision_info(chat_template)
 
         inputs = self._processor(
             text=[text], images=image_inputs, padding=True, return_tensors="pt"
         )
 
-        if torch.cuda.is_available():
-            inputs = inputs.to("cuda")
+        device = get_device()
+        if device == "cuda":
+            # Pinned host buffers let the copy run as an async DMA; work
+            # queued on the same stream afterwards still sees the data
+            for key, value in inputs.items():
+                if isinstance(value, torch.Tensor):
+                    inputs[key] = value.pin_memory()
+            inputs = inputs.to(device, non_blocking=True)
+        elif device != "cpu":
+            inputs = inputs.to(device)
 
-        generated_ids = self._model.generate(**inputs, max_new_tokens=max_new_tokens)
+        return inputs
 
-        generated_ids_trimmed = [
-            out_ids[len(in_ids) :]
-            for in_ids, out_ids in zip(inputs.input_ids, generated_ids)
+    def _render_prompt_uncached(self, num_images: int, text_query: str) -> str:
+        """Render the chat template text for num_images images and a query.
+
+        The rendered text only depends on how many images there are, not on
+        their pixels, so it is cached per (num_images, text_query).
+        """
+        chat_template = [
+            {
+                "role": "user",
+                "content": [{"type": "image"}] * num_images
+                + [{"type": "text", "text": text_query}],
+            }
         ]
+        return self._processor.apply_chat_template(
+            chat_template, tokenize=False, add_generation_prompt=True
+        )
 
-        return self._processor.batch_decode(
-            generated_ids_trimmed,
-            skip_special_tokens=True,
-            clean_up_tokenization_spaces=False,
+    def _cached_prefix(self, images: List[Image.Image], inputs) -> Any:
+        """Return a private copy of the prefix KV cache for images.
+
+        Computes and stores the prefix on a miss. The model's rope offsets
+        are restored from the entry so decoding continues at the positions
+        the cached prefix ended at.
+        """
+        key = self._kv_cache.make_key(images)
+        entry = self._kv_cache.get(key, map_location=inputs.input_ids.device)
+        if entry is None:
+            entry = self._compute_prefix(inputs)
+            self._kv_cache.put(key, entry)
+
+        self._rope_owner().rope_deltas = entry["rope_deltas"]
+        # generate() extends the cache in place; keep the stored entry intact
+        return copy.deepcopy(entry["past_key_values"])
+
+    def _compute_prefix(self, inputs) -> Dict[str, Any]:
+        """Prefill the prompt up to and including the last image."""
+        import torch
+
+        prefix_len = self._prefix_length(inputs.input_ids)
+
+        with torch.no_grad():
+            outputs = self._model(
+                input_ids=inputs.input_ids[:, :prefix_len],
+                attention_mask=inputs.attention_mask[:, :prefix_len],
+                pixel_values=inputs.pixel_values,
+                image_grid_thw=inputs.image_grid_thw,
+                use_cache=True,
+            )
+
+        return {
+            "past_key_values": outputs.past_key_values,
+            "rope_deltas": outputs.rope_deltas,
+            "prefix_len": prefix_len,
+        }
+
+    def _prefix_length(self, input_ids) -> int:
+        """Number of prompt tokens up to and including the last image."""
+        vision_end_id = self._processor.tokenizer.convert_tokens_to_ids(
+            "<|vision_end|>"
         )
+        positions = (input_ids[0] == vision_end_id).nonzero()
+        return int(positions[-1]) + 1
+
+    def _rope_owner(self):
+        """Module holding the multimodal rope offsets across decoding steps."""
+        return getattr(self._model, "model", self._model)
@@ -3,18 +3,28 @@
 Manages model lifecycle and provides clean API for RAG operations
 using ColPali embeddings stored in Qdrant vector database.
 """
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from PIL import Image
 
 from config import AppConfig, get_config
 from models.loader import ModelLoader
-from models.colpali_embedder import ColPaliEmbedder
 from models.retrieval_model import RetrievalModel
 from models.vision_model import VisionLanguageModel
-from storage.vector_store import QdrantVectorStore
-from storage.converter import convert_pdfs_to_images, list_available_files
+from storage.index_manifest import IndexManifest
+from storage.semantic_cache import SemanticCache
+from storage.converter import (
+    count_pages,
+    iter_document_pages,
+    list_available_files,
+    render_pages,
+)
 
 
 @dataclass
@@ -47,7 +57,27 @@ class RAGService:
         self._loader = ModelLoader(self.config.model)
         self._retrieval_model: Optional[RetrievalModel] = None
         self._vl_model: Optional[VisionLanguageModel] = None
-        self._all_images: Dict[int, List[Image.Image]] = {}
+        self._vl_lock = threading.Lock()
+        # Error from the background VL preload, raised by the next
+        # initialize_vl() call
+        self._vl_preload_error: Optional[BaseException] = None
+        # Indexed document folder, its files in doc_id order and doc_id ->
+        # page count; pages are rendered on demand rather than held in memory
+        self._folder = self.config.storage.data_dir
+        self._files: List[str] = []
+        self._page_counts: Dict[int, int] = {}
+        # What the Qdrant collection was built from; None when unknown
+        self._manifest: Optional[IndexManifest] = None
+        # PDF render workers, created on first index and reused afterwards
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._semantic_cache: Optional[SemanticCache] = None
+        if self.config.rag.semantic_cache:
+            self._semantic_cache = SemanticCache(
+                threshold=self.config.rag.semantic_cache_threshold,
+                path=self.config.rag.semantic_cache_path,
+                max_entries=self.config.rag.semantic_cache_max_entries,
+            )
+            atexit.register(self._semantic_cache.save)
 
     @property
     def is_initialized(self) -> bool:
@@ -62,9 +92,17 @@ class RAGService:
     def initialize_retrieval(self) -> None:
         """Load retrieval model and initialize Qdrant (lazy initialization)."""
         if self._retrieval_model is None:
+            # torch-backed modules are imported on first model load, so
+            # importing this module stays cheap
+            from models.colpali_embedder import ColPaliEmbedder
+            from storage.vector_store import QdrantVectorStore
+
             # Load ColPali model and processor
             model, processor = self._loader.load_colpali_model()
             embedder = ColPaliEmbedder(model, processor)
+            if self.config.model.compile_retrieval_model:
+                # Compile the query path now rather than on the first query
+                embedder.embed_query("warmup")
 
             # Initialize Qdrant vector store
             vector_store = QdrantVectorStore(self.config.qdrant)
@@ -73,18 +111,93 @@ class RAGService:
             self._retrieval_model = RetrievalModel(embedder, vector_store)
             self._retrieval_model.initialize()
 
+            # Reusing a persisted index: doc_ids refer to the files it was
+            # built from, not to the folder's current contents
+            if self._retrieval_model.is_indexed:
+                self._manifest = IndexManifest.load(self._manifest_path())
+                if self._manifest is not None:
+                    self._load_page_counts(
+                        self._manifest.folder, self._manifest.files
+                    )
+                    # Saved answers are only valid for this exact index
+                    if self._semantic_cache is not None:
+                        self._semantic_cache.version = self._manifest.fingerprint()
+                        self._semantic_cache.load()
+                else:
+                    # Index predates the manifest; serve it as the folder is
+                    # now until index_documents() rebuilds it
+                    self._load_page_counts(
+                        self._folder,
+                        list_available_files(
+                            self._folder, self.config.storage.supported_extensions
+                        ),
+                    )
+
     def initialize_vl(self) -> None:
-        """Load vision-language model (lazy initialization)."""
-        if self._vl_model is None:
+        """Load vision-language model (lazy initialization).
+
+        Raises:
+            Exception: The error a background preload failed with, once;
+                later calls try loading again
+        """
+        if self._vl_model is not None:
+            return
+
+        # Indexing may be preloading on another thread; wait for it rather
+        # than loading a second copy
+        with self._vl_lock:
+            if self._vl_model is not None:
+                return
+            if self._vl_preload_error is not None:
+                error, self._vl_preload_error = self._vl_preload_error, None
+                raise error
+
             model = self._loader.load_vl_model()
             processor = self._loader.load_vl_processor()
-            self._vl_model = VisionLanguageModel(model, processor)
+            kv_cache = None
+            if self.config.rag.kv_cache_dir:
+                from models.kv_cache import PrefixKVCache
+
+                kv_cache = PrefixKVCache(
+                    self.config.rag.kv_cache_dir, self.config.model.vl_model_name
+                )
+            vl_model = VisionLanguageModel(model, processor, kv_cache=kv_cache)
+            vl_model.warmup(generate=self.config.model.compile_vl_model)
+            self._vl_model = vl_model
+
+    def _preload_vl(self) -> None:
+        """Load the VL model on a background thread.
+
+        Failures are printed and kept for the next initialize_vl() call to
+        raise, so they surface on the query that needs the model instead of
+        silently triggering another load.
+        """
+        try:
+            self.initialize_vl()
+        except Exception as e:
+            print(f"Warning: Failed to preload the VL model: {e}")
+            with self._vl_lock:
+                self._vl_preload_error = e
+
+    def warmup(self) -> None:
+        """Load the retrieval and vision-language models up front.
+
+        Models stay resident on the service, so calling this once at startup
+        moves the load cost out of the first query.
+        """
+        self.initialize_retrieval()
+        self.initialize_vl()
 
     def index_documents(
         self, folder: Optional[str] = None, overwrite: bool = False
     ) -> str:
         """Index documents in folder.
 
+        Without overwrite, an existing index of the same folder is reused:
+        files added since are indexed on their own, and the index is only
+        rebuilt when an indexed file was removed or modified. An index with
+        no manifest path to compare against is reused as is.
+
         Args:
             folder: Document folder (uses config default if None)
             overwrite: Whether to overwrite existing index
@@ -101,17 +214,70 @@ class RAGService:
         # Initialize retrieval model if needed
         self.initialize_retrieval()
 
-        # Convert PDFs/images to PIL images
-        self._all_images = convert_pdfs_to_images(
-            folder, self.config.storage.supported_extensions
+        manifest_path = self._manifest_path()
+        if (
+            not overwrite
+            and self._retrieval_model.is_indexed
+            and self._manifest is None
+            and manifest_path is None
+        ):
+            # No manifest can ever be saved for this index, so treating that
+            # as stale would rebuild it on every auto-prepare; keep it
+            return f"Already indexed {len(self._files)} file(s) from {self._folder}."
+
+        # Compare the folder against what the persisted collection holds
+        manifest = IndexManifest.scan(folder, files)
+        new_doc_ids = None
+        if not overwrite and self._retrieval_model.is_indexed and self._manifest:
+            extended = self._manifest.extend(manifest)
+            if extended is not None:
+                indexed = len(self._manifest.files)
+                if len(extended.files) == indexed:
+                    return f"Already indexed {indexed} file(s) from {folder}."
+                manifest = extended
+                new_doc_ids = set(range(indexed, len(extended.files)))
+        if new_doc_ids is None:
+            # Indexed files changed, or the index predates the manifest:
+            # doc_ids would no longer line up, so rebuild from scratch. The
+            # old manifest goes first, so an interrupted rebuild is never
+            # mistaken for a complete index.
+            overwrite = True
+            self._manifest = None
+            if manifest_path and os.path.exists(manifest_path):
+                os.remove(manifest_path)
+
+        # Load the VL model while pages are rendered and embedded, so the
+        # first query doesn't pay for it
+        if self.config.rag.preload_vl and self._vl_model is None:
+            threading.Thread(target=self._preload_vl, daemon=True).start()
+
+        # Snapshot the file list: doc_ids stay tied to it even if files are
+        # added to the folder later. Page counts tell the embedding cache
+        # when a document is complete.
+        self._load_page_counts(folder, manifest.files)
+
+        # Stream rendered pages (or cached embeddings) into the Qdrant index
+        pages, on_embedded = self._index_pages(
+            folder, manifest.files, doc_ids=new_doc_ids
         )
-
-        # Index images with Qdrant
         self._retrieval_model.index(
-            images=self._all_images,
+            pages=pages,
             overwrite=overwrite,
+            batch_size=self.config.storage.index_batch_size,
+            on_embedded=on_embedded,
         )
+        self._manifest = manifest
+        manifest.save(manifest_path)
+
+        # Cached answers reference doc_ids that may have changed
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear(version=manifest.fingerprint())
 
+        if self.config.rag.kv_cache_dir and self.config.rag.precompute_kv_cache:
+            self._precompute_kv_cache()
+
+        if new_doc_ids is not None:
+            return f"Indexed {len(new_doc_ids)} new file(s) from {folder}."
         return f"Indexed {len(files)} file(s) from {folder}."
 
     def query(
@@ -145,19 +311,28 @@ class RAGService:
                 "Documents must be indexed first. Call index_documents()."
             )
 
+        # Serve repeated and near-duplicate questions from the semantic
+        # cache; exact repeats are matched by text before embedding
+        cache_params = (top_k, max_new_tokens, pages_before, pages_after)
+        cached = self._cached_answer(text_query, None, cache_params)
+        if cached is not None:
+            return cached
+
+        query_embedding = self._retrieval_model.embed_query(text_query)
+        cached = self._cached_answer(text_query, query_embedding, cache_params)
+        if cached is not None:
+            return cached
+
         # Ensure VL model is loaded
         self.initialize_vl()
 
-        # Retrieve relevant pages
-        results = self._retrieval_model.search(text_query, k=top_k)
-
-        # Expand results with adjacent pages for cross-page content
-        expanded_results = self._expand_with_overlap(
-            results, pages_before=pages_before, pages_after=pages_after
+        # Retrieve relevant pages, expanded with adjacent pages
+        expanded_pages = self._retrieve(
+            query_embedding, top_k, pages_before, pages_after
         )
 
-        # Map results to images
-        retrieved_images = self._get_images_from_results(expanded_results)
+        # Map pages to images
+        retrieved_images = self._get_page_images(expanded_pages)
 
         # Generate answer
         texts = self._vl_model.generate(
@@ -167,8 +342,77 @@ class RAGService:
         )
 
         answer = texts[0] if texts else ""
+        self._cache_answer(
+            text_query, query_embedding, answer, expanded_pages, cache_params
+        )
+
         return answer, retrieved_images
 
+    def query_stream(
+        self,
+        text_query: str,
+        top_k: Optional[int] = None,
+        max_new_tokens: Optional[int] = None,
+        pages_before: Optional[int] = None,
+        pages_after: Optional[int] = None,
+    ) -> Iterator[Tuple[str, List[Image.Image]]]:
+        """Execute RAG query, yielding the answer as it is generated.
+
+        Args:
+            text_query: User question
+            top_k: Number of pages to retrieve (uses config default if None)
+            max_new_tokens: Maximum tokens for generation (uses config default if None)
+            pages_before: Pages to include before each result (uses config default if None)
+            pages_after: Pages to include after each result (uses config default if None)
+
+        Yields:
+            Tuples of (answer_so_far, retrieved_images)
+
+        Raises:
+            RuntimeError: If not indexed or models not loaded
+        """
+        top_k = top_k or self.config.rag.default_top_k
+        max_new_tokens = max_new_tokens or self.config.rag.default_max_new_tokens
+
+        if not self.is_indexed:
+            raise RuntimeError(
+                "Documents must be indexed first. Call index_documents()."
+            )
+
+        cache_params = (top_k, max_new_tokens, pages_before, pages_after)
+        cached = self._cached_answer(text_query, None, cache_params)
+        if cached is not None:
+            yield cached
+            return
+
+        query_embedding = self._retrieval_model.embed_query(text_query)
+        cached = self._cached_answer(text_query, query_embedding, cache_params)
+        if cached is not None:
+            yield cached
+            return
+
+        self.initialize_vl()
+        expanded_pages = self._retrieve(
+            query_embedding, top_k, pages_before, pages_after
+        )
+        retrieved_images = self._get_page_images(expanded_pages)
+
+        # Show the retrieved pages before the first token arrives
+        answer = ""
+        yield answer, retrieved_images
+
+        for new_text in self._vl_model.generate_stream(
+            images=retrieved_images,
+            text_query=text_query,
+            max_new_tokens=max_new_tokens,
+        ):
+            answer += new_text
+            yield answer, retrieved_images
+
+        self._cache_answer(
+            text_query, query_embedding, answer, expanded_pages, cache_params
+        )
+
     def query_with_details(
         self,
         text_query: str,
@@ -203,22 +447,17 @@ class RAGService:
         # Ensure VL model is loaded
         self.initialize_vl()
 
-        # Retrieve relevant pages
+        # Retrieve relevant pages as (doc_id, page_num) tuples
         results = self._retrieval_model.search(text_query, k=top_k)
-
-        # Extract retrieved pages as (doc_id, page_num) tuples
         retrieved_pages = [(r["doc_id"], r["page_num"]) for r in results]
 
-        # Expand results with adjacent pages for cross-page content
-        expanded_results = self._expand_with_overlap(
-            results, pages_before=pages_before, pages_after=pages_after
+        # Expand with adjacent pages for cross-page content
+        expanded_pages = self._expand_with_overlap(
+            retrieved_pages, pages_before=pages_before, pages_after=pages_after
         )
 
-        # Extract expanded pages as tuples
-        expanded_pages = [(r["doc_id"], r["page_num"]) for r in expanded_results]
-
-        # Map results to images
-        retrieved_images = self._get_images_from_results(expanded_results)
+        # Map pages to images
+        retrieved_images = self._get_page_images(expanded_pages)
 
         # Generate answer
         texts = self._vl_model.generate(
@@ -236,72 +475,262 @@ class RAGService:
             expanded_pages=expanded_pages,
         )
 
-    def _get_images_from_results(self, results: List[dict]) -> List[Image.Image]:
-        """Map retrieval results to PIL images.
+    def _get_render_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Return the shared PDF render pool, creating it on first use.
+
+        Returns:
+            Process pool, or None when pages are not cached on disk (workers
+            hand pages back through the cache) or only one worker is set
+        """
+        storage = self.config.storage
+        workers = storage.render_workers or os.cpu_count() or 1
+        if storage.cache_dir is None or workers <= 1:
+            return None
+
+        if self._render_pool is None:
+            # By now torch, CUDA and Gradio have started threads; forking
+            # them can deadlock a worker, so start workers with spawn
+            self._render_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(self._render_pool.shutdown)
+        return self._render_pool
+
+    def _retrieve(
+        self,
+        query_embedding,
+        top_k: int,
+        pages_before: Optional[int],
+        pages_after: Optional[int],
+    ) -> List[Tuple[int, int]]:
+        """Search with a query embedding and expand hits with adjacent pages."""
+        results = self._retrieval_model.search_by_embedding(query_embedding, k=top_k)
+        return self._expand_with_overlap(
+            [(r["doc_id"], r["page_num"]) for r in results],
+            pages_before=pages_before,
+            pages_after=pages_after,
+        )
+
+    def _cached_answer(
+        self, text_query: str, query_embedding, cache_params: tuple
+    ) -> Optional[Tuple[str, List[Image.Image]]]:
+        """Look up an earlier answer to the same or an equivalent query.
 
         Args:
-            results: List of dicts with 'doc_id' and 'page_num' (1-indexed)
+            text_query: User question
+            query_embedding: Query embedding, or None to only match the
+                question text exactly (before the query is embedded)
+            cache_params: Query parameters the answer must have been
+                generated with
 
         Returns:
-            List of PIL images
+            Tuple of (answer, page images) on a hit, otherwise None
         """
-        images = []
-        for result in results:
-            doc_id = result["doc_id"]
-            page_num = result["page_num"]  # 1-indexed
-            if doc_id in self._all_images:
-                page_idx = page_num - 1
-                if 0 <= page_idx < len(self._all_images[doc_id]):
-                    images.append(self._all_images[doc_id][page_idx])
-        return images
+        if self._semantic_cache is None:
+            return None
+
+        if query_embedding is None:
+            cached = self._semantic_cache.lookup_text(text_query, cache_params)
+        else:
+            cached = self._semantic_cache.lookup(
+                query_embedding.float().cpu().numpy(), cache_params
+            )
+        if cached is None:
+            return None
+
+        answer, pages = cached
+        return answer, self._get_page_images(pages)
+
+    def _cache_answer(
+        self,
+        text_query: str,
+        query_embedding,
+        answer: str,
+        pages: List[Tuple[int, int]],
+        cache_params: tuple,
+    ) -> None:
+        """Store a generated answer in the semantic cache."""
+        if self._semantic_cache is None:
+            return
+
+        self._semantic_cache.add(
+            query_embedding.float().cpu().numpy(),
+            answer,
+            pages,
+            cache_params,
+            text=text_query,
+        )
+
+    def _precompute_kv_cache(self) -> None:
+        """Prefill VL KV caches for the page window around every indexed page.
+
+        Each window matches what a top-1 query for that page expands to, so
+        default-configured queries start from a cached image prefix.
+        """
+        self.initialize_vl()
+        for doc_id, total_pages in self._page_counts.items():
+            for page_num in range(1, total_pages + 1):
+                window = self._expand_with_overlap([(doc_id, page_num)])
+                self._vl_model.prefill(self._get_page_images(window))
+
+    def _index_pages(
+        self, folder: str, files: List[str], doc_ids: Optional[set] = None
+    ) -> Tuple[Iterator, Optional[Callable]]:
+        """Build the page stream and embedding callback for indexing.
+
+        Documents with cached embeddings are streamed as precomputed
+        embeddings without rendering; the rest are rendered, and their
+        embeddings are saved to the cache once all their pages are done.
+
+        Args:
+            folder: Document folder
+            files: Supported files in folder, in doc_id order
+            doc_ids: Optional subset of documents to index (default: all)
+
+        Returns:
+            Tuple of (pages, on_embedded) for RetrievalModel.index()
+        """
+        storage = self.config.storage
+
+        def render(doc_ids) -> Iterator:
+            return iter_document_pages(
+                folder,
+                storage.supported_extensions,
+                dpi=storage.dpi,
+                cache_dir=storage.cache_dir,
+                render_workers=storage.render_workers,
+                executor=self._get_render_pool(),
+                doc_ids=doc_ids,
+                files=files,
+            )
+
+        if not storage.embedding_cache_dir:
+            return render(doc_ids), None
+
+        from storage.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(
+            storage.embedding_cache_dir,
+            self.config.model.retrieval_model_name,
+            storage.dpi,
+        )
+        keys = {
+            doc_id: cache.make_key(os.path.join(folder, filename))
+            for doc_id, filename in enumerate(files)
+            if doc_ids is None or doc_id in doc_ids
+        }
+        hits = [doc_id for doc_id, key in keys.items() if key in cache]
+        misses = set(keys).difference(hits)
+
+        def pages() -> Iterator:
+            for doc_id in hits:
+                for page_idx, embedding in enumerate(cache.get(keys[doc_id])):
+                    yield doc_id, page_idx + 1, embedding
+            if misses:
+                yield from render(misses)
+
+        fresh: Dict[int, list] = {}
+
+        def on_embedded(doc_id: int, page_num: int, embedding) -> None:
+            doc_pages = fresh.setdefault(doc_id, [])
+            # Always copy: on CPU, .cpu() would return a view that keeps the
+            # whole batch output alive until the document completes
+            doc_pages.append(embedding.detach().to("cpu", copy=True))
+            if len(doc_pages) == self._page_counts.get(doc_id):
+                cache.put(keys[doc_id], fresh.pop(doc_id))
+
+        return pages(), on_embedded
+
+    def _load_page_counts(self, folder: str, files: List[str]) -> None:
+        """Record the indexed folder, its files and per-document page counts."""
+        self._folder = folder
+        self._files = list(files)
+        self._page_counts = count_pages(
+            folder, self.config.storage.supported_extensions, files=self._files
+        )
+
+    def _manifest_path(self) -> Optional[str]:
+        """Return where the indexed file list is saved next to the collection.
+
+        Returns:
+            Manifest path, or None for a purely in-memory collection that
+            does not outlive the process
+        """
+        qdrant = self.config.qdrant
+        if qdrant.use_memory and not qdrant.persist_directory:
+            return None
+        return os.path.join(
+            qdrant.persist_directory or ".",
+            f"{qdrant.collection_name}.manifest.json",
+        )
+
+    def _get_page_images(self, pages: List[Tuple[int, int]]) -> List[Image.Image]:
+        """Render the given pages.
+
+        Args:
+            pages: List of (doc_id, page_num) tuples; page_num is 1-indexed
+
+        Returns:
+            List of PIL images in page order
+        """
+        rendered = render_pages(
+            self._folder,
+            pages,
+            self.config.storage.supported_extensions,
+            dpi=self.config.storage.dpi,
+            cache_dir=self.config.storage.cache_dir,
+            files=self._files,
+        )
+        return [rendered[key] for key in pages if key in rendered]
 
     def _expand_with_overlap(
         self,
-        results: List[dict],
+        pages: List[Tuple[int, int]],
         pages_before: Optional[int] = None,
         pages_after: Optional[int] = None,
-    ) -> List[dict]:
-        """Expand search results to include adjacent pages.
+    ) -> List[Tuple[int, int]]:
+        """Expand retrieved pages to include adjacent pages.
 
         Args:
-            results: Original search results with 'doc_id' and 'page_num'
+            pages: Retrieved (doc_id, page_num) tuples
             pages_before: Pages to include before each result (uses config if None)
             pages_after: Pages to include after each result (uses config if None)
 
         Returns:
-            Expanded results with adjacent pages, deduplicated and sorted
+            Expanded (doc_id, page_num) tuples, deduplicated, capped at
+            config.rag.max_images and sorted.
+            The canonical order is applied even without overlap, so the same
+            page set always yields the same image prefix and can share a
+            cached VL prefill across queries.
         """
         pages_before = pages_before if pages_before is not None else self.config.rag.pages_before
         pages_after = pages_after if pages_after is not None else self.config.rag.pages_after
 
-        # Skip if no overlap needed
-        if pages_before == 0 and pages_after == 0:
-            return results
-
-        seen: set = set()
-        expanded: List[dict] = []
-
-        for result in results:
-            doc_id = result["doc_id"]
-            page_num = result["page_num"]
-
+        expanded: set = set()
+        for doc_id, page_num in pages:
             # Get total pages for this document
-            if doc_id not in self._all_images:
+            total_pages = self._page_counts.get(doc_id)
+            if total_pages is None:
                 continue
-            total_pages = len(self._all_images[doc_id])
 
-            # Calculate page range with boundary handling
+            # Add pages in range, with boundary handling
             start_page = max(1, page_num - pages_before)
             end_page = min(total_pages, page_num + pages_after)
+            expanded.update((doc_id, p) for p in range(start_page, end_page + 1))
+
+        max_images = self.config.rag.max_images
+        if max_images is not None and len(expanded) > max_images:
+            # Keep retrieved pages first, then the neighbours closest to the
+            # highest-ranked hits
+            ranked = sorted(
+                expanded,
+                key=lambda key: min(
+                    (abs(key[1] - hit_page), rank)
+                    for rank, (hit_doc, hit_page) in enumerate(pages)
+                    if hit_doc == key[0]
+                ),
+            )
+            expanded = set(ranked[:max_images])
 
-            # Add pages in range
-            for p in range(start_page, end_page + 1):
-                key = (doc_id, p)
-                if key not in seen:
-                    seen.add(key)
-                    expanded.append({"doc_id": doc_id, "page_num": p})
-
-        # Sort by document order (doc_id, then page_num)
-        expanded.sort(key=lambda x: (x["doc_id"], x["page_num"]))
-
-        return expanded
+        # Tuples sort by document order (doc_id, then page_num)
+        return sorted(expanded)
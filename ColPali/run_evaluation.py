@@ -119,6 +119,12 @@ def main():
     print(f"Dataset: {report.dataset_name}")
     print(f"Test Cases: {report.total_test_cases}")
     print(f"Judge Model: {args.model}")
+    if report.total_test_cases:
+        hit_rate = report.rag_cache_hits / report.total_test_cases * 100
+        print(
+            f"Repeated Questions: {report.rag_cache_hits} "
+            f"({hit_rate:.1f}% served from cache)"
+        )
 
     print("\nGeneration Metrics:")
     for metric, value in report.aggregate_generation_metrics.items():
@@ -129,11 +135,25 @@ def main():
         for metric, value in report.aggregate_retrieval_metrics.items():
             print(f"  {metric}: {value:.4f}")
 
-    # Calculate average latency
-    avg_latency = sum(r.latency_ms for r in report.individual_results) / len(
-        report.individual_results
+    # Calculate average latency over questions that actually ran RAG
+    rag_latencies = [
+        r.latency_ms
+        for r in report.individual_results
+        if not r.metadata.get("rag_cached")
+    ]
+    avg_latency = (
+        sum(rag_latencies) / len(rag_latencies) if rag_latencies else 0.0
+    )
+    judge_latencies = [
+        r.judge_latency_ms
+        for r in report.individual_results
+        if r.judge_latency_ms is not None
+    ]
+    avg_judge_latency = (
+        sum(judge_latencies) / len(judge_latencies) if judge_latencies else 0.0
     )
     print(f"\nAverage Latency: {avg_latency:.1f} ms")
+    print(f"Average Judge Latency: {avg_judge_latency:.1f} ms")
 
     print(f"\nReports saved to {args.output_dir}/")
     print("  - report.json (full results)")
@@ -1,13 +1,53 @@
-"""Storage module for file operations."""
-from .downloader import download_file, download_pdfs, add_file_to_storage
-from .converter import convert_pdfs_to_images, list_available_files
-from .vector_store import QdrantVectorStore
-
-__all__ = [
-    "download_file",
-    "download_pdfs",
-    "add_file_to_storage",
-    "convert_pdfs_to_images",
-    "list_available_files",
-    "QdrantVectorStore",
-]
+"""Storage module for file operations.
+
+The vector store and caches pull in torch and numpy, so the public
+names are imported lazily on first attribute access (PEP 562).
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .downloader import download_file, download_pdfs, add_file_to_storage
+    from .converter import (
+        convert_pdfs_to_images,
+        count_pages,
+        iter_document_pages,
+        list_available_files,
+        render_pages,
+        render_pdf,
+    )
+    from .embedding_cache import EmbeddingCache
+    from .index_manifest import IndexManifest
+    from .semantic_cache import SemanticCache
+    from .vector_store import QdrantVectorStore
+
+_EXPORTS = {
+    "download_file": ".downloader",
+    "download_pdfs": ".downloader",
+    "add_file_to_storage": ".downloader",
+    "convert_pdfs_to_images": ".converter",
+    "count_pages": ".converter",
+    "iter_document_pages": ".converter",
+    "list_available_files": ".converter",
+    "render_pages": ".converter",
+    "render_pdf": ".converter",
+    "EmbeddingCache": ".embedding_cache",
+    "IndexManifest": ".index_manifest",
+    "SemanticCache": ".semantic_cache",
+    "QdrantVectorStore": ".vector_store",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,8 +1,14 @@
 """PDF and image conversion utilities."""
+import hashlib
 import os
-from typing import Dict, List, Tuple
+import shutil
+import threading
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from pdf2image import convert_from_path
+import fitz
 from PIL import Image
 
 
@@ -19,39 +25,363 @@ def list_available_files(
     Returns:
         Sorted list of filenames
     """
-    if not os.path.exists(folder):
+    try:
+        mtime_ns = os.stat(folder).st_mtime_ns
+    except FileNotFoundError:
         return []
-    return sorted(
-        [f for f in os.listdir(folder) if f.lower().endswith(supported_extensions)]
-    )
+    return list(_scan_folder(folder, mtime_ns, tuple(supported_extensions)))
 
 
-def convert_pdfs_to_images(
+@lru_cache(maxsize=32)
+def _scan_folder(
+    folder: str, mtime_ns: int, supported_extensions: Tuple[str, ...]
+) -> Tuple[str, ...]:
+    """Scan folder once per directory mtime; adding or removing files
+    bumps the mtime and so invalidates the cached listing."""
+    with os.scandir(folder) as entries:
+        # is_dir() is answered from the directory entry, without a stat
+        names = [
+            entry.name
+            for entry in entries
+            if entry.name.lower().endswith(supported_extensions)
+            and not entry.is_dir()
+        ]
+    names.sort()
+    return tuple(names)
+
+
+def _render_page(page: "fitz.Page", dpi: int) -> Image.Image:
+    """Rasterize a single PyMuPDF page to an RGB PIL Image."""
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csRGB)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def _open_image(path: str) -> Image.Image:
+    """Open an image file as RGB.
+
+    The image is decoded eagerly so the file handle is released right away,
+    and only converted when it isn't already RGB.
+    """
+    img = Image.open(path)
+    img.load()
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return img
+
+
+def _page_cache_dir(cache_root: str, pdf_path: str, dpi: int) -> str:
+    """Return the page cache directory for a PDF, dropping stale entries.
+
+    The directory is keyed by a hash of the first MiB of the PDF, its size
+    and the rendering dpi, so changing the resolution never serves pages
+    rendered at another one. A cache older than the PDF itself is treated
+    as stale and cleared.
+    """
+    digest = hashlib.sha1()
+    with open(pdf_path, "rb") as f:
+        digest.update(f.read(1 << 20))
+    digest.update(f":{os.path.getsize(pdf_path)}:{dpi}".encode("ascii"))
+    cache_dir = os.path.join(cache_root, digest.hexdigest())
+
+    if os.path.isdir(cache_dir) and os.path.getmtime(cache_dir) < os.path.getmtime(
+        pdf_path
+    ):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def _load_page(
+    doc: "fitz.Document", page_num: int, dpi: int, cache_dir: Optional[str]
+) -> Image.Image:
+    """Load a 1-indexed PDF page from the JPEG cache, rendering on a miss."""
+    if cache_dir is None:
+        return _render_page(doc.load_page(page_num - 1), dpi)
+
+    cached_path = os.path.join(cache_dir, f"{page_num:04d}.jpg")
+    if os.path.exists(cached_path):
+        return _open_image(cached_path)
+
+    image = _render_page(doc.load_page(page_num - 1), dpi)
+    # Write then rename, so an interrupted save never leaves a truncated
+    # JPEG and concurrent readers never see a partial one. The temp name is
+    # per process and thread, as render workers and query threads may
+    # render the same page at once.
+    tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    image.save(tmp_path, "JPEG", quality=85)
+    os.replace(tmp_path, cached_path)
+    return image
+
+
+def render_pdf(path: str, dpi: int = 100) -> List[Image.Image]:
+    """Render every page of a PDF to a PIL Image.
+
+    Args:
+        path: PDF file path
+        dpi: Rendering resolution
+
+    Returns:
+        List of RGB page images in page order
+    """
+    doc = fitz.open(path)
+    try:
+        return [_render_page(page, dpi) for page in doc]
+    finally:
+        doc.close()
+
+
+def _render_one(pdf_path: str, dpi: int, cache_root: str) -> List[str]:
+    """Render a PDF into the page cache and return its page JPEG paths.
+
+    Module-level so it can be pickled into a ProcessPoolExecutor worker.
+    """
+    doc_cache = _page_cache_dir(cache_root, pdf_path, dpi)
+    doc = fitz.open(pdf_path)
+    try:
+        paths = []
+        for page_num in range(1, doc.page_count + 1):
+            _load_page(doc, page_num, dpi, doc_cache)
+            paths.append(os.path.join(doc_cache, f"{page_num:04d}.jpg"))
+        return paths
+    finally:
+        doc.close()
+
+
+def iter_document_pages(
     folder: str,
     supported_extensions: Tuple[str, ...] = (".pdf", ".png", ".jpg", ".jpeg"),
-) -> Dict[int, List[Image.Image]]:
-    """Convert all supported files in folder to PIL Images.
+    dpi: int = 100,
+    cache_dir: Optional[str] = None,
+    render_workers: Optional[int] = 1,
+    executor: Optional[Executor] = None,
+    doc_ids: Optional[Container[int]] = None,
+    files: Optional[List[str]] = None,
+) -> Iterator[Tuple[int, int, Image.Image]]:
+    """Stream every page of every supported file in folder.
+
+    Pages are yielded one at a time, so memory stays bounded by the
+    consumer rather than by corpus size. With a cache_dir and more than one
+    worker, PDFs are rasterized in parallel processes into the page cache
+    and the cached JPEGs are streamed back in document order.
+
+    Args:
+        folder: Directory containing PDFs/images
+        supported_extensions: File extensions to process
+        dpi: Rendering resolution for PDF pages
+        cache_dir: Optional root directory for cached page JPEGs
+        render_workers: PDF rendering processes (None uses all CPUs)
+        executor: Optional long-lived process pool to render PDFs on instead
+            of a per-call pool; requires cache_dir and is not shut down here
+        doc_ids: Optional subset of documents to render; doc_ids still
+            number every supported file in folder
+        files: Optional precomputed list_available_files() result, to
+            skip rescanning folder
+
+    Yields:
+        Tuples of (doc_id, page_num, image); page_num is 1-indexed
+    """
+    if files is None:
+        files = list_available_files(folder, supported_extensions)
+    selected = [
+        (doc_id, filename)
+        for doc_id, filename in enumerate(files)
+        if doc_ids is None or doc_id in doc_ids
+    ]
+    pdf_paths = {
+        doc_id: os.path.join(folder, filename)
+        for doc_id, filename in selected
+        if filename.lower().endswith(".pdf")
+    }
+
+    if cache_dir is not None and executor is not None and pdf_paths:
+        yield from _iter_pages_pooled(
+            executor, folder, selected, pdf_paths, dpi, cache_dir
+        )
+        return
+
+    workers = min(render_workers or os.cpu_count() or 1, len(pdf_paths))
+    if cache_dir is None or workers <= 1:
+        yield from _iter_pages_serial(folder, selected, dpi, cache_dir)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _iter_pages_pooled(
+            pool, folder, selected, pdf_paths, dpi, cache_dir
+        )
+
+
+def _iter_pages_pooled(
+    executor: Executor,
+    folder: str,
+    docs: List[Tuple[int, str]],
+    pdf_paths: Dict[int, str],
+    dpi: int,
+    cache_dir: str,
+) -> Iterator[Tuple[int, int, Image.Image]]:
+    """Render PDFs into the page cache on executor, yielding in order."""
+    futures = {
+        doc_id: executor.submit(_render_one, path, dpi, cache_dir)
+        for doc_id, path in pdf_paths.items()
+    }
+    for doc_id, filename in docs:
+        if doc_id in futures:
+            for page_idx, page_path in enumerate(futures[doc_id].result()):
+                yield doc_id, page_idx + 1, _open_image(page_path)
+        else:
+            try:
+                img = _open_image(os.path.join(folder, filename))
+            except Exception:
+                continue
+            yield doc_id, 1, img
+
+
+def _iter_pages_serial(
+    folder: str, docs: List[Tuple[int, str]], dpi: int, cache_dir: Optional[str]
+) -> Iterator[Tuple[int, int, Image.Image]]:
+    """Render pages in the current process, one document at a time."""
+    for doc_id, filename in docs:
+        path = os.path.join(folder, filename)
+        if filename.lower().endswith(".pdf"):
+            doc_cache = _page_cache_dir(cache_dir, path, dpi) if cache_dir else None
+            doc = fitz.open(path)
+            try:
+                for page_num in range(1, doc.page_count + 1):
+                    yield doc_id, page_num, _load_page(doc, page_num, dpi, doc_cache)
+            finally:
+                doc.close()
+        else:
+            try:
+                img = _open_image(path)
+            except Exception:
+                continue
+            yield doc_id, 1, img
+
+
+def count_pages(
+    folder: str,
+    supported_extensions: Tuple[str, ...] = (".pdf", ".png", ".jpg", ".jpeg"),
+    files: Optional[List[str]] = None,
+) -> Dict[int, int]:
+    """Count pages per document without rendering them.
 
     Args:
         folder: Directory containing PDFs/images
         supported_extensions: File extensions to process
+        files: Optional file list in doc_id order, e.g. the one the index
+            was built from; defaults to rescanning folder
 
     Returns:
-        Mapping of doc_id -> list of PIL Images
+        Mapping of doc_id -> number of pages
     """
-    files = list_available_files(folder, supported_extensions)
-    all_images: Dict[int, List[Image.Image]] = {}
+    if files is None:
+        files = list_available_files(folder, supported_extensions)
+    counts: Dict[int, int] = {}
 
     for doc_id, filename in enumerate(files):
-        path = os.path.join(folder, filename)
         if filename.lower().endswith(".pdf"):
-            images = convert_from_path(path)
-            all_images[doc_id] = images
+            doc = fitz.open(os.path.join(folder, filename))
+            try:
+                counts[doc_id] = doc.page_count
+            finally:
+                doc.close()
         else:
+            counts[doc_id] = 1
+
+    return counts
+
+
+def render_pages(
+    folder: str,
+    targets: Iterable[Tuple[int, int]],
+    supported_extensions: Tuple[str, ...] = (".pdf", ".png", ".jpg", ".jpeg"),
+    dpi: int = 100,
+    cache_dir: Optional[str] = None,
+    files: Optional[List[str]] = None,
+) -> Dict[Tuple[int, int], Image.Image]:
+    """Render only the requested pages, opening each document once.
+
+    Args:
+        folder: Directory containing PDFs/images
+        targets: (doc_id, page_num) pairs to render; page_num is 1-indexed
+        supported_extensions: File extensions to process
+        dpi: Rendering resolution for PDF pages
+        cache_dir: Optional root directory for cached page JPEGs
+        files: Optional file list in doc_id order, e.g. the one the index
+            was built from; defaults to rescanning folder
+
+    Returns:
+        Mapping of (doc_id, page_num) -> PIL Image. Pages that do not
+        exist or fail to load are omitted.
+    """
+    if files is None:
+        files = list_available_files(folder, supported_extensions)
+
+    pages_by_doc: Dict[int, List[int]] = defaultdict(list)
+    for doc_id, page_num in targets:
+        pages_by_doc[doc_id].append(page_num)
+
+    rendered: Dict[Tuple[int, int], Image.Image] = {}
+    for doc_id, page_nums in pages_by_doc.items():
+        if not 0 <= doc_id < len(files):
+            continue
+        filename = files[doc_id]
+        path = os.path.join(folder, filename)
+
+        if filename.lower().endswith(".pdf"):
+            doc_cache = _page_cache_dir(cache_dir, path, dpi) if cache_dir else None
+            doc = fitz.open(path)
             try:
-                img = Image.open(path).convert("RGB")
-                all_images[doc_id] = [img]
+                # Ascending order keeps reads sequential within the PDF
+                for page_num in sorted(set(page_nums)):
+                    if 1 <= page_num <= doc.page_count:
+                        rendered[(doc_id, page_num)] = _load_page(
+                            doc, page_num, dpi, doc_cache
+                        )
+            finally:
+                doc.close()
+        elif 1 in page_nums:
+            try:
+                rendered[(doc_id, 1)] = _open_image(path)
             except Exception:
                 continue
 
+    return rendered
+
+
+def convert_pdfs_to_images(
+    folder: str,
+    supported_extensions: Tuple[str, ...] = (".pdf", ".png", ".jpg", ".jpeg"),
+    dpi: int = 100,
+    cache_dir: Optional[str] = None,
+    render_workers: Optional[int] = 1,
+    files: Optional[List[str]] = None,
+) -> Dict[int, List[Image.Image]]:
+    """Convert all supported files in folder to PIL Images.
+
+    Holds every page in memory; prefer iter_document_pages() or
+    render_pages() for large corpora.
+
+    Args:
+        folder: Directory containing PDFs/images
+        supported_extensions: File extensions to process
+        dpi: Rendering resolution for PDF pages
+        cache_dir: Optional root directory for cached page JPEGs
+        render_workers: PDF rendering processes (None uses all CPUs);
+            more than one requires cache_dir
+        files: Optional precomputed list_available_files() result, to
+            skip rescanning folder
+
+    Returns:
+        Mapping of doc_id -> list of PIL Images
+    """
+    all_images: Dict[int, List[Image.Image]] = {}
+    for doc_id, _, image in iter_document_pages(
+        folder,
+        supported_extensions,
+        dpi,
+        cache_dir=cache_dir,
+        render_workers=render_workers,
+        files=files,
+    ):
+        all_images.setdefault(doc_id, []).append(image)
     return all_images
@@ -0,0 +1,85 @@
+"""On-disk cache of ColPali page embeddings.
+
+Lets re-indexing skip the vision encoder for documents whose contents
+have not changed since they were last embedded.
+"""
+import hashlib
+import os
+from typing import List, Optional
+
+import torch
+
+
+class EmbeddingCache:
+    """Per-document cache of page embeddings keyed by file contents.
+
+    Keys hash the full file bytes together with the retrieval model name
+    and rendering dpi, so edited documents, a different model or another
+    resolution never reuse stale embeddings.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, dpi: int):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for serialized embeddings
+            model_name: Retrieval model name, mixed into every key
+            dpi: PDF rendering resolution, mixed into every key
+        """
+        self._cache_dir = cache_dir
+        self._model_name = model_name
+        self._dpi = dpi
+
+    def make_key(self, path: str) -> str:
+        """Build a cache key for a document file.
+
+        Args:
+            path: Document file path
+
+        Returns:
+            Hex digest identifying the file contents, model and dpi
+        """
+        digest = hashlib.sha256(f"{self._model_name}:{self._dpi}:".encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[torch.Tensor]]:
+        """Load the page embeddings for a document.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            One (num_patches, dim) CPU tensor per page in page order, or
+            None on miss
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        return torch.load(path, map_location="cpu")
+
+    def put(self, key: str, embeddings: List[torch.Tensor]) -> None:
+        """Store the page embeddings for a document.
+
+        Args:
+            key: Key from make_key()
+            embeddings: One (num_patches, dim) tensor per page in page order
+        """
+        os.makedirs(self._cache_dir, exist_ok=True)
+        # clone() gives each page its own storage: pages are often unbind()
+        # views of a batch output, and torch.save would otherwise write the
+        # whole batch into every document's file
+        pages = [e.detach().cpu().clone() for e in embeddings]
+        # Write then rename, so an interrupted save never leaves a
+        # truncated entry behind
+        path = self._path(key)
+        torch.save(pages, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.pt")
@@ -0,0 +1,109 @@
+"""File manifest persisted alongside the Qdrant collection.
+
+Qdrant points only store doc_id and page_num, so the list of files the
+collection was built from is saved here; doc_ids index into that list,
+not into whatever the data folder happens to contain later.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class IndexManifest:
+    """Folder and files an index was built from, in doc_id order."""
+
+    folder: str
+    files: List[str] = field(default_factory=list)
+    # (size, mtime_ns) per file, to notice files replaced in place
+    stats: List[Tuple[int, int]] = field(default_factory=list)
+
+    @classmethod
+    def scan(cls, folder: str, files: List[str]) -> "IndexManifest":
+        """Build a manifest from the current state of files in folder.
+
+        Args:
+            folder: Document folder
+            files: Files in folder, in doc_id order
+
+        Returns:
+            Manifest with each file's current size and mtime
+        """
+        stats = []
+        for filename in files:
+            st = os.stat(os.path.join(folder, filename))
+            stats.append((st.st_size, st.st_mtime_ns))
+        return cls(folder=folder, files=list(files), stats=stats)
+
+    def extend(self, current: "IndexManifest") -> Optional["IndexManifest"]:
+        """Append the files current has beyond this manifest.
+
+        Existing files keep their doc_ids and new files are numbered after
+        them, so an index built from this manifest only needs the new
+        files added.
+
+        Args:
+            current: Manifest scanned from the folder as it is now
+
+        Returns:
+            The extended manifest (equal to this one when nothing was
+            added), or None when current is another folder or an indexed
+            file was removed or modified, which needs a full re-index
+        """
+        if current.folder != self.folder:
+            return None
+
+        now = dict(zip(current.files, current.stats))
+        for filename, stat in zip(self.files, self.stats):
+            if now.pop(filename, None) != stat:
+                return None
+
+        added = [filename for filename in current.files if filename in now]
+        return IndexManifest(
+            folder=self.folder,
+            files=self.files + added,
+            stats=self.stats + [now[filename] for filename in added],
+        )
+
+    def fingerprint(self) -> str:
+        """Return a digest identifying this exact folder and file state."""
+        data = json.dumps([self.folder, self.files, self.stats])
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> Optional["IndexManifest"]:
+        """Load a manifest saved by save().
+
+        Args:
+            path: Manifest file path
+
+        Returns:
+            The manifest, or None when path is unset, missing or unreadable
+        """
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(
+                folder=data["folder"],
+                files=list(data["files"]),
+                stats=[(int(size), int(mtime)) for size, mtime in data["stats"]],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Optional[str]) -> None:
+        """Write the manifest to path (no-op when path is unset)."""
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Write then rename, so an interrupted save never leaves a
+        # truncated manifest behind
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {"folder": self.folder, "files": self.files, "stats": self.stats}, f
+            )
+        os.replace(path + ".tmp", path)
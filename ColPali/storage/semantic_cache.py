@@ -0,0 +1,279 @@
+"""Semantic answer cache keyed by query embeddings.
+
+Lets RAGService answer near-duplicate questions without running retrieval
+or generation again.
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Cached answer: (answer_text, [(doc_id, page_num), ...])
+CachedAnswer = Tuple[str, List[Tuple[int, int]]]
+
+
+class SemanticCache:
+    """Nearest-neighbour cache over normalized query embeddings.
+
+    Multi-vector query embeddings are mean-pooled to a single vector and
+    L2-normalized, so finding candidates is one matrix-vector product
+    against all prior queries. Mean-pooling is dominated by the tokens every
+    ColPali query shares (prefix, augmentation), so a candidate is only
+    served once a token-level check confirms it: every token of either
+    query must have a match in the other at the same threshold. Repeats of the same question text are also indexed by
+    text, so they can be answered before the query is even embedded. The
+    oldest entries are evicted once max_entries is reached.
+
+    Safe to share between threads. Cached pages are only meaningful for
+    the index they were retrieved from, so entries are tagged with an
+    index version and a saved cache from another version is not loaded.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = 128,
+        version: str = "",
+    ):
+        """Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit, both between
+                the pooled embeddings and for every token's best match
+            path: Optional .npz file used by load() and save()
+            max_entries: Maximum cached answers (None for unbounded)
+            version: Identifies the index cached pages refer to
+        """
+        self.threshold = threshold
+        self.path = path
+        self.max_entries = max_entries
+        self.version = version
+        # Rows span the embedding matrix and the parallel lists below, so
+        # every read and write of them holds this lock
+        self._lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None  # (N, d) float32
+        # Per-entry normalized token embeddings, (num_tokens, d) float32
+        self._tokens: List[np.ndarray] = []
+        self._answers: List[str] = []
+        self._pages: List[List[Tuple[int, int]]] = []
+        self._params: List[str] = []
+        self._texts: List[str] = []
+        # Exact-match key -> row index, rebuilt whenever rows shift
+        self._by_text: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def lookup_text(self, text: str, params: Sequence = ()) -> Optional[CachedAnswer]:
+        """Find a cached answer for the same question text.
+
+        Matching ignores case and whitespace differences.
+
+        Args:
+            text: Query text
+            params: Query parameters that must match exactly (e.g. top_k)
+
+        Returns:
+            Tuple of (answer, pages) on a hit, otherwise None
+        """
+        key = self._text_key(text, json.dumps(list(params)))
+        with self._lock:
+            row = self._by_text.get(key)
+            if row is None:
+                return None
+            return self._answers[row], list(self._pages[row])
+
+    def lookup(
+        self, embedding: np.ndarray, params: Sequence = ()
+    ) -> Optional[CachedAnswer]:
+        """Find a cached answer for a semantically equivalent query.
+
+        Args:
+            embedding: Query embedding, (num_tokens, d) or (d,)
+            params: Query parameters that must match exactly (e.g. top_k)
+
+        Returns:
+            Tuple of (answer, pages) on a hit, otherwise None
+        """
+        query = self._normalize(embedding)
+        query_tokens = self._token_matrix(embedding)
+        key = json.dumps(list(params))
+        with self._lock:
+            if self._embeddings is None:
+                return None
+
+            sims = self._embeddings @ query
+            mask = np.array([p == key for p in self._params], dtype=bool)
+            if not mask.any():
+                return None
+
+            sims = np.where(mask, sims, -np.inf)
+            # Best pooled candidates first; serve the first one that the
+            # token-level check confirms
+            for row in np.argsort(-sims):
+                if sims[row] < self.threshold:
+                    break
+                if self._tokens_match(query_tokens, self._tokens[row]):
+                    return self._answers[row], list(self._pages[row])
+            return None
+
+    def add(
+        self,
+        embedding: np.ndarray,
+        answer: str,
+        pages: List[Tuple[int, int]],
+        params: Sequence = (),
+        text: str = "",
+    ) -> None:
+        """Store an answer for a query embedding.
+
+        Args:
+            embedding: Query embedding, (num_tokens, d) or (d,)
+            answer: Generated answer text
+            pages: (doc_id, page_num) pages the answer was generated from
+            params: Query parameters the answer depends on
+            text: Query text, enabling lookup_text() for exact repeats
+        """
+        row = self._normalize(embedding)[np.newaxis, :]
+        tokens = self._token_matrix(embedding)
+        params_key = json.dumps(list(params))
+        with self._lock:
+            if self.max_entries is not None and len(self) >= self.max_entries:
+                self._evict(len(self) - self.max_entries + 1)
+
+            if self._embeddings is None:
+                self._embeddings = row
+            else:
+                self._embeddings = np.vstack([self._embeddings, row])
+            self._tokens.append(tokens)
+            self._answers.append(answer)
+            self._pages.append([tuple(p) for p in pages])
+            self._params.append(params_key)
+            self._texts.append(text)
+            if text:
+                self._by_text[self._text_key(text, params_key)] = len(self) - 1
+
+    def clear(self, version: Optional[str] = None) -> None:
+        """Drop all cached answers (e.g. after re-indexing).
+
+        Args:
+            version: Optional new index version for answers added from now on
+        """
+        with self._lock:
+            self._embeddings = None
+            self._tokens = []
+            self._answers = []
+            self._pages = []
+            self._params = []
+            self._texts = []
+            self._by_text = {}
+            if version is not None:
+                self.version = version
+
+    def save(self) -> None:
+        """Persist the cache to self.path (no-op when empty or no path)."""
+        with self._lock:
+            if not self.path or self._embeddings is None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            np.savez(
+                self.path,
+                embeddings=self._embeddings,
+                tokens=np.concatenate(self._tokens),
+                token_counts=np.array([len(t) for t in self._tokens]),
+                answers=np.array(self._answers, dtype=str),
+                pages=np.array([json.dumps(p) for p in self._pages], dtype=str),
+                params=np.array(self._params, dtype=str),
+                texts=np.array(self._texts, dtype=str),
+                version=np.array(self.version, dtype=str),
+            )
+
+    def load(self) -> None:
+        """Load a previously saved cache from self.path if it exists.
+
+        A cache saved for another index version (or before caches were
+        versioned) is ignored, since its pages may point at other files, as
+        is one saved without token embeddings to confirm hits with.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        with self._lock, np.load(self.path) as data:
+            if "version" not in data or str(data["version"]) != self.version:
+                return
+            if "tokens" not in data:
+                return
+            self._embeddings = data["embeddings"].astype(np.float32)
+            offsets = np.cumsum(data["token_counts"])[:-1]
+            self._tokens = np.split(data["tokens"].astype(np.float32), offsets)
+            self._answers = [str(a) for a in data["answers"]]
+            self._pages = [
+                [tuple(p) for p in json.loads(str(s))] for s in data["pages"]
+            ]
+            self._params = [str(p) for p in data["params"]]
+            # Caches saved before exact-match lookup have no texts
+            if "texts" in data:
+                self._texts = [str(t) for t in data["texts"]]
+            else:
+                self._texts = [""] * len(self._answers)
+
+            if self.max_entries is not None and len(self) > self.max_entries:
+                self._evict(len(self) - self.max_entries)
+            else:
+                self._reindex_texts()
+
+    def _evict(self, count: int) -> None:
+        """Drop the count oldest entries; the caller holds self._lock.
+
+        Rows shift down by count, so _by_text is rebuilt under the same
+        lock before any lookup can see the new row numbers.
+        """
+        self._embeddings = self._embeddings[count:] if len(self) > count else None
+        del self._tokens[:count]
+        del self._answers[:count]
+        del self._pages[:count]
+        del self._params[:count]
+        del self._texts[:count]
+        self._reindex_texts()
+
+    def _reindex_texts(self) -> None:
+        """Rebuild the exact-match index; the caller holds self._lock."""
+        self._by_text = {
+            self._text_key(text, params): row
+            for row, (text, params) in enumerate(zip(self._texts, self._params))
+            if text
+        }
+
+    @staticmethod
+    def _text_key(text: str, params_key: str) -> str:
+        return " ".join(text.lower().split()) + "\0" + params_key
+
+    def _tokens_match(self, a: np.ndarray, b: np.ndarray) -> bool:
+        """Check that every token of a and b has a match in the other.
+
+        Both token matrices are L2-normalized, so this is the minimum over
+        tokens of their best cosine similarity (MaxSim) in both directions.
+        """
+        sims = a @ b.T
+        return bool(
+            sims.max(axis=1).min() >= self.threshold
+            and sims.max(axis=0).min() >= self.threshold
+        )
+
+    @staticmethod
+    def _token_matrix(embedding: np.ndarray) -> np.ndarray:
+        tokens = np.asarray(embedding, dtype=np.float32)
+        if tokens.ndim == 1:
+            tokens = tokens[np.newaxis, :]
+        norms = np.linalg.norm(tokens, axis=1, keepdims=True)
+        return tokens / np.where(norms > 0, norms, 1.0)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.ndim == 2:
+            vector = vector.mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
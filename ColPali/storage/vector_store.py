@@ -3,13 +3,41 @@
 Provides multi-vector storage and MaxSim retrieval using Qdrant's
 native support for late interaction models.
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import torch
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Batch,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CompressionRatio,
+    Distance,
+    MultiVectorComparator,
+    MultiVectorConfig,
+    PointStruct,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 
 from config import QdrantConfig
 
 
+def _to_vectors(tensor: torch.Tensor) -> List[List[float]]:
+    """Convert a (num_vectors, dim) tensor to nested float lists for Qdrant.
+
+    Goes through a float32 numpy array, whose tolist() builds the nested
+    lists in C; Tensor.tolist() boxes every element through the tensor API.
+    """
+    return tensor.detach().to("cpu", torch.float32).numpy().tolist()
+
+
 class QdrantVectorStore:
     """Qdrant wrapper for ColPali multi-vector storage."""
 
@@ -21,17 +49,13 @@ class QdrantVectorStore:
         """
         self._config = config
         self._client = None
+        # Points queued by add_document() until the next flush()
+        self._pending: List[PointStruct] = []
+        # Collection point count, cached until the next write
+        self._point_count: Optional[int] = None
 
     def initialize(self) -> None:
         """Initialize Qdrant client and create collection if needed."""
-        from qdrant_client import QdrantClient
-        from qdrant_client.models import (
-            Distance,
-            VectorParams,
-            MultiVectorConfig,
-            MultiVectorComparator,
-        )
-
         if self._config.use_memory:
             # In-memory storage with optional persistence
             self._client = QdrantClient(
@@ -44,13 +68,12 @@ class QdrantVectorStore:
             self._client = QdrantClient(
                 host=self._config.host,
                 port=self._config.port,
+                grpc_port=self._config.grpc_port,
+                prefer_grpc=self._config.prefer_grpc,
             )
 
-        # Check if collection exists
-        collections = self._client.get_collections().collections
-        collection_names = [c.name for c in collections]
-
-        if self._config.collection_name not in collection_names:
+        self._point_count = None
+        if not self._client.collection_exists(self._config.collection_name):
             # Create collection with multi-vector support
             self._client.create_collection(
                 collection_name=self._config.collection_name,
@@ -61,8 +84,56 @@ class QdrantVectorStore:
                         comparator=MultiVectorComparator.MAX_SIM
                     ),
                 ),
+                quantization_config=self._quantization_config(),
             )
 
+    def _quantization_config(self) -> Any:
+        """Build the collection quantization config from QdrantConfig.
+
+        Returns:
+            Qdrant quantization config, or None when disabled
+
+        Raises:
+            ValueError: If the configured quantization is unknown
+        """
+        quantization = self._config.quantization
+        if quantization == "none":
+            return None
+        if quantization == "int8":
+            # One byte per dimension, 4x smaller than float32
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8, always_ram=True
+                )
+            )
+        if quantization == "pq8":
+            # 16 one-byte codes per 128-d vector
+            return ProductQuantization(
+                product=ProductQuantizationConfig(
+                    compression=CompressionRatio.X32, always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=True)
+            )
+        raise ValueError(f"Unknown Qdrant quantization: {quantization}")
+
+    def _search_params(self) -> Any:
+        """Search params that rescore quantized candidates with originals.
+
+        Oversampling fetches extra candidates from the quantized index so
+        rescoring can recover results the compressed vectors ranked too low.
+        """
+        if self._config.quantization == "none":
+            return None
+
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=True, oversampling=self._config.oversampling
+            )
+        )
+
     def add_document(
         self,
         point_id: int,
@@ -70,7 +141,10 @@ class QdrantVectorStore:
         page_num: int,
         embeddings: torch.Tensor,
     ) -> None:
-        """Add a document page with its multi-vector embeddings.
+        """Queue a document page with its multi-vector embeddings.
+
+        Points are buffered and upserted upsert_batch_size at a time; call
+        flush() once the last page has been added.
 
         Args:
             point_id: Unique point ID in Qdrant
@@ -78,24 +152,32 @@ class QdrantVectorStore:
             page_num: Page number (1-indexed)
             embeddings: Multi-vector embeddings tensor (num_patches, embedding_dim)
         """
-        from qdrant_client.models import PointStruct
+        self._pending.append(
+            PointStruct(
+                id=point_id,
+                vector=_to_vectors(embeddings),
+                payload={
+                    "doc_id": doc_id,
+                    "page_num": page_num,
+                },
+            )
+        )
+        if len(self._pending) >= self._config.upsert_batch_size:
+            self.flush()
 
-        # Convert tensor to list of lists
-        vectors = embeddings.cpu().float().tolist()
+    def flush(self) -> None:
+        """Upsert points queued by add_document()."""
+        if not self._pending:
+            return
 
+        points, self._pending = self._pending, []
         self._client.upsert(
             collection_name=self._config.collection_name,
-            points=[
-                PointStruct(
-                    id=point_id,
-                    vector=vectors,
-                    payload={
-                        "doc_id": doc_id,
-                        "page_num": page_num,
-                    },
-                )
-            ],
+            points=points,
         )
+        # Invalidate after the write so a concurrent count can't cache
+        # the pre-upsert value
+        self._point_count = None
 
     def add_documents_batch(
         self,
@@ -106,15 +188,12 @@ class QdrantVectorStore:
         Args:
             points: List of dicts with 'point_id', 'doc_id', 'page_num', 'embeddings'
         """
-        from qdrant_client.models import PointStruct
-
         qdrant_points = []
         for p in points:
-            vectors = p["embeddings"].cpu().float().tolist()
             qdrant_points.append(
                 PointStruct(
                     id=p["point_id"],
-                    vector=vectors,
+                    vector=_to_vectors(p["embeddings"]),
                     payload={
                         "doc_id": p["doc_id"],
                         "page_num": p["page_num"],
@@ -126,6 +205,33 @@ class QdrantVectorStore:
             collection_name=self._config.collection_name,
             points=qdrant_points,
         )
+        self._point_count = None
+
+    def add_documents_soa(
+        self,
+        ids: List[int],
+        embeddings: Sequence[torch.Tensor],
+        payloads: List[Dict[str, Any]],
+    ) -> None:
+        """Add document pages given as parallel lists.
+
+        Uploads a single Qdrant Batch, so no per-point PointStruct is built.
+
+        Args:
+            ids: Unique point IDs in Qdrant
+            embeddings: Multi-vector embeddings, one (num_patches, dim) tensor
+                per point
+            payloads: Dicts with 'doc_id' and 'page_num', one per point
+        """
+        self._client.upsert(
+            collection_name=self._config.collection_name,
+            points=Batch(
+                ids=ids,
+                vectors=[_to_vectors(e) for e in embeddings],
+                payloads=payloads,
+            ),
+        )
+        self._point_count = None
 
     def search(
         self,
@@ -141,13 +247,14 @@ class QdrantVectorStore:
         Returns:
             List of results with 'doc_id', 'page_num', and 'score'
         """
-        # Convert tensor to list of lists
-        query_vectors = query_embedding.cpu().float().tolist()
+        # Make pages queued by add_document() searchable
+        self.flush()
 
         results = self._client.query_points(
             collection_name=self._config.collection_name,
-            query=query_vectors,
+            query=_to_vectors(query_embedding),
             limit=top_k,
+            search_params=self._search_params(),
             with_payload=True,
         )
 
@@ -162,6 +269,8 @@ class QdrantVectorStore:
 
     def delete_collection(self) -> None:
         """Delete the entire collection."""
+        self._pending = []
+        self._point_count = None
         if self._client:
             try:
                 self._client.delete_collection(self._config.collection_name)
@@ -171,6 +280,9 @@ class QdrantVectorStore:
     def collection_exists(self) -> bool:
         """Check if collection exists and has documents.
 
+        Points queued by add_document() are flushed and counted, via
+        get_point_count().
+
         Returns:
             True if collection exists and has at least one point
         """
@@ -178,29 +290,33 @@ class QdrantVectorStore:
             return False
 
         try:
-            collections = self._client.get_collections().collections
-            collection_names = [c.name for c in collections]
-
-            if self._config.collection_name not in collection_names:
+            if self._point_count is None and not self._client.collection_exists(
+                self._config.collection_name
+            ):
                 return False
-
-            # Check if collection has points
-            info = self._client.get_collection(self._config.collection_name)
-            return info.points_count > 0
+            return self.get_point_count() > 0
         except Exception:
             return False
 
     def get_point_count(self) -> int:
         """Get the number of points in the collection.
 
+        Points queued by add_document() are flushed first, so they are
+        counted. The count is cached until the next upsert or collection
+        reset.
+
         Returns:
             Number of points, or 0 if collection doesn't exist
         """
         if self._client is None:
             return 0
+        self.flush()
+        if self._point_count is not None:
+            return self._point_count
 
         try:
             info = self._client.get_collection(self._config.collection_name)
-            return info.points_count
         except Exception:
             return 0
+        self._point_count = info.points_count or 0
+        return self._point_count